@@ -0,0 +1,18 @@
+"""Hilfsfunktionen für Benchmarks: Module der Integration ohne Home Assistant laden."""
+from __future__ import annotations
+import importlib
+import sys
+import types
+from pathlib import Path
+
+COMPONENT = Path(__file__).resolve().parent.parent / "custom_components" / "veoovibes"
+PACKAGE = "veoovibes_bench"
+
+
+def load_module(name: str):
+    """Modul aus custom_components/veoovibes laden, ohne das Paket-__init__ (HA) auszuführen."""
+    if PACKAGE not in sys.modules:
+        pkg = types.ModuleType(PACKAGE)
+        pkg.__path__ = [str(COMPONENT)]
+        sys.modules[PACKAGE] = pkg
+    return importlib.import_module(f"{PACKAGE}.{name}")
@@ -0,0 +1,112 @@
+"""Benchmark: Dekodierung großer listrooms/room_player_status-Antworten.
+
+Vergleicht den bisherigen Pfad (json.loads + setdefault auf den vollen Dicts) mit dem
+neuen (schneller Decoder, früher status/code-Check, Projektion auf die benötigten Felder).
+Gemessen werden Zeit, Spitzen- und dauerhaft gehaltener Speicher (tracemalloc).
+Aufruf: python benchmarks/bench_decode.py [--rooms 50 200 1000] [--extra 40]
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import timeit
+import tracemalloc
+
+from _util import load_module
+
+api = load_module("api")
+model = load_module("model")
+
+
+def _room(i: int, extra: int) -> dict:
+    room = {"id_room": i, "name": f"Raum {i}", "api_room_name": f"room_{i}"}
+    # Controller liefern viele Felder, die die Integration nie liest
+    room.update({f"setting_{k}": f"value {k} " * 4 for k in range(extra)})
+    room["outputs"] = [{"id": k, "label": f"out {k}", "gain": k * 0.5} for k in range(extra // 4)]
+    return room
+
+
+def _status(i: int, extra: int) -> dict:
+    st = {
+        "is_playing": 1, "status_code": "playing", "zone_volume": 40, "repeat": "off",
+        "title": f"Track {i}", "artist": "Artist", "album": "Album", "cover": f"/cover/{i}.jpg",
+        "group": 1, "prog": i % 10, "position": 12, "duration": 240,
+    }
+    st.update({f"eq_{k}": k for k in range(extra)})
+    st["queue"] = [{"title": f"Next {k}", "artist": "Artist", "duration": 200} for k in range(extra)]
+    return st
+
+
+def _body(result) -> bytes:
+    return json.dumps({"status": "succeeded", "code": "0", "result": result}).encode()
+
+
+# --- bisheriger Pfad (Referenz) ---
+def _legacy_rooms(body: bytes) -> list:
+    data = json.loads(body)
+    ok = data.get("status") == "succeeded" and str(data.get("code")) == "0"
+    assert ok
+    out = []
+    for key, val in data.get("result").items():
+        if isinstance(val, dict):
+            val.setdefault("key", key)
+            out.append(val)
+    return out
+
+
+def _legacy_status(body: bytes) -> dict:
+    data = json.loads(body)
+    assert data.get("status") == "succeeded" and str(data.get("code")) == "0"
+    return data.get("result")
+
+
+# --- neuer Pfad ---
+def _lean_rooms(body: bytes) -> list:
+    C = api.VeoovibesClient
+    return C._dict_result_to_list(C._check_result("listrooms", api._json_loads(body)))
+
+
+def _lean_status(body: bytes) -> dict:
+    C = api.VeoovibesClient
+    return C._lean_status(C._check_result("room_player_status", api._json_loads(body)))
+
+
+def _measure(fn, bodies: list, number: int) -> tuple[float, int, int]:
+    """(ms pro Durchlauf, Spitze KiB, gehalten KiB) für das Dekodieren aller bodies."""
+    t = timeit.timeit(lambda: [fn(b) for b in bodies], number=number) / number * 1e3
+    gc.collect()
+    tracemalloc.start()
+    kept = [fn(b) for b in bodies]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return t, peak // 1024, current // 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rooms", type=int, nargs="*", default=[50, 200, 1000])
+    parser.add_argument("--extra", type=int, default=40, help="ungenutzte Zusatzfelder je Eintrag")
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"decoder: {api._json_loads.__module__}")
+    print(f"{'payload':>18} {'path':>7} {'ms':>8} {'peak KiB':>9} {'kept KiB':>9}")
+    for n in args.rooms:
+        cases = (
+            ("listrooms", [_body({str(i): _room(i, args.extra) for i in range(n)})],
+             _legacy_rooms, _lean_rooms),
+            ("room_status", [_body(_status(i, args.extra)) for i in range(n)],
+             _legacy_status, _lean_status),
+        )
+        for label, bodies, legacy, lean in cases:
+            # Gleiches Ergebnis für die Felder, die RoomStatus/Entities tatsächlich lesen
+            if label == "room_status":
+                assert model.RoomStatus.from_payload(legacy(bodies[0])) == model.RoomStatus.from_payload(lean(bodies[0]))
+            for path, fn in (("legacy", legacy), ("lean", lean)):
+                t, peak, kept = _measure(fn, bodies, args.number)
+                print(f"{label + ' x' + str(n):>18} {path:>7} {t:>8.2f} {peak:>9} {kept:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Benchmark: Dauer eines Status-Zyklus (sequentiell vs. parallel) über Raumanzahl.
+
+Aufruf: python benchmarks/bench_fanout.py [--latency 0.05] [--concurrency 4]
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+from _util import load_module
+from fake_controller import FakeController
+
+api = load_module("api")
+
+
+async def _cycle(client, concurrency: int, timeout: float) -> float:
+    start = time.perf_counter()
+    rooms = await client.list_rooms()
+    ids = [r.get("id_room") or r.get("key") for r in rooms]
+    await client.get_room_statuses(ids, max_concurrency=concurrency, room_timeout=timeout)
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=8.0)
+    parser.add_argument("--rooms", type=int, nargs="*", default=[1, 5, 10, 20, 40])
+    args = parser.parse_args()
+
+    print(f"{'rooms':>6} {'sequential':>12} {'c=' + str(args.concurrency):>12} {'unbounded':>12}")
+    for n in args.rooms:
+        fake = FakeController(rooms=n, latency=args.latency, jitter=args.jitter)
+        base = await fake.start()
+        async with aiohttp.ClientSession() as session:
+            client = api.VeoovibesClient(base, "key", False, session)
+            seq = await _cycle(client, 1, args.timeout)
+            bounded = await _cycle(client, args.concurrency, args.timeout)
+            unbounded = await _cycle(client, n, args.timeout)
+        await fake.stop()
+        print(f"{n:>6} {seq:>11.3f}s {bounded:>11.3f}s {unbounded:>11.3f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
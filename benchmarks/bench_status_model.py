@@ -0,0 +1,92 @@
+"""Micro-Benchmark: Property-Zugriff auf rohe Status-Dicts vs. vorab geparsten RoomStatus.
+
+Simuliert je Raum einen Refresh (Parse) und N State-Writes (Property-Zugriffe).
+Aufruf: python benchmarks/bench_status_model.py [--rooms 50] [--reads 20]
+"""
+from __future__ import annotations
+import argparse
+import random
+import timeit
+
+from _util import load_module
+
+model = load_module("model")
+
+
+def _payload(i: int) -> dict:
+    return {
+        "room": str(i),
+        "is_playing": i % 3 == 0,
+        "status_code": random.choice(["playing", "stopped", "Playing"]),
+        "zone_volume": random.randint(0, 100),
+        "repeat": random.choice(["all", "off", "1", 0, True]),
+        "title": f"Track {i}",
+        "artist": "Artist",
+        "album": "Album",
+        "cover": f"http://controller/cover/{i}.jpg",
+        "radio_name": "FM4",
+        "group": 1,
+        "prog": i % 10,
+    }
+
+
+# --- bisherige Property-Logik auf dem rohen Dict (Referenz) ---
+def _legacy_read(st: dict) -> tuple:
+    playing = bool(st.get("is_playing", 0)) or str(st.get("status_code", "")).lower() == "playing"
+    vol = st.get("zone_volume")
+    if isinstance(vol, (int, float)):
+        volume = max(0.0, min(1.0, float(vol) / 100.0))
+    else:
+        vol2 = st.get("current_volume")
+        volume = max(0.0, min(1.0, float(vol2) / 100.0)) if isinstance(vol2, (int, float)) else None
+    rep = st.get("repeat")
+    if isinstance(rep, (bool, int)):
+        repeat = bool(rep)
+    elif isinstance(rep, str):
+        repeat = rep.lower() in ("all", "one", "true", "1")
+    else:
+        repeat = False
+    return (
+        playing, volume, repeat,
+        st.get("title") or st.get("radio_name"), st.get("artist"), st.get("album"), st.get("cover"),
+    )
+
+
+def _model_read(st) -> tuple:
+    return (st.playing, st.volume, st.repeat, st.title, st.artist, st.album, st.cover)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rooms", type=int, nargs="*", default=[10, 50, 200])
+    parser.add_argument("--reads", type=int, default=20, help="Property-Zugriffe je Raum und Refresh")
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'rooms':>6} {'parse':>10} {'legacy':>10} {'parse+read':>10}  (µs pro Refresh)")
+    for n in args.rooms:
+        payloads = [_payload(i) for i in range(n)]
+        parsed = [model.RoomStatus.from_payload(p) for p in payloads]
+
+        def legacy():
+            for p in payloads:
+                for _ in range(args.reads):
+                    _legacy_read(p)
+
+        def parse():
+            for p in payloads:
+                model.RoomStatus.from_payload(p)
+
+        def read_model():
+            for st in parsed:
+                for _ in range(args.reads):
+                    _model_read(st)
+
+        t_parse = timeit.timeit(parse, number=args.number) / args.number * 1e6
+        t_legacy = timeit.timeit(legacy, number=args.number) / args.number * 1e6
+        t_model = timeit.timeit(read_model, number=args.number) / args.number * 1e6
+        print(f"{n:>6} {t_parse:>10.1f} {t_legacy:>10.1f} {t_parse + t_model:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Lasttest: Poll-Zyklen (RoomPoller wie im Coordinator-_update) gegen den Fake-Controller.
+
+Berichtet je Raumanzahl die Zykluslatenz (p50/p95), Requests pro Minute und die maximale
+Blockierzeit der Event-Loop.
+
+Aufruf: python benchmarks/bench_suite.py [--rooms 1 10 50 100 200] [--duration 10]
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+from _util import load_module
+from fake_controller import FakeController
+
+api = load_module("api")
+metrics = load_module("metrics")
+poller_mod = load_module("poller")
+scheduler_mod = load_module("scheduler")
+topology_mod = load_module("topology")
+
+
+async def _loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Maximale Verspätung eines kurzen Sleeps = längste Blockierung der Event-Loop."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def _run(args, rooms: int) -> dict:
+    fake = FakeController(
+        rooms=rooms,
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        playing_ratio=args.playing_ratio,
+        seed=1,
+    )
+    base = await fake.start()
+    async with aiohttp.ClientSession() as session:
+        client = api.VeoovibesClient(base, "key", False, session)
+        topology = topology_mod.RoomTopologyCache(client, args.topology_interval)
+        if args.adaptive:
+            scheduler = scheduler_mod.AdaptivePollScheduler(args.interval, 10, 120)
+        else:
+            # jeder Raum in jedem Zyklus (wie das frühere feste Polling)
+            scheduler = scheduler_mod.AdaptivePollScheduler(0, 0, 0)
+        poll_metrics = metrics.PollMetrics()
+        poller = poller_mod.RoomPoller(
+            client, topology, scheduler, poll_metrics,
+            max_concurrency=args.concurrency, room_timeout=args.room_timeout,
+        )
+
+        data = await poller.async_poll(None)  # erster Refresh (Setup) nicht mitzählen
+        fake.reset_counters()
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(_loop_lag(stop))
+        cycles = metrics.LatencyStats()
+        start = time.perf_counter()
+        while time.perf_counter() - start < args.duration:
+            tick = time.perf_counter()
+            try:
+                data = await poller.async_poll(data)
+                cycles.record(time.perf_counter() - tick)
+            except api.VeoovibesApiError:
+                cycles.record(time.perf_counter() - tick, ok=False)
+            await asyncio.sleep(max(0.0, args.interval - (time.perf_counter() - tick)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        lag = await lag_task
+        client.close()
+    await fake.stop()
+    pct = cycles.percentiles((50, 95))
+    return {
+        "rooms": rooms,
+        "cycles": cycles.count,
+        "errors": cycles.errors,
+        "p50": pct["p50"] or 0.0,
+        "p95": pct["p95"] or 0.0,
+        "req_per_min": fake.requests / elapsed * 60.0,
+        "max_loop_block_ms": lag * 1000.0,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rooms", type=int, nargs="*", default=[1, 10, 50, 100, 200])
+    parser.add_argument("--duration", type=float, default=10.0, help="Sekunden je Raumanzahl")
+    parser.add_argument("--interval", type=float, default=2.0, help="Poll-Takt in Sekunden")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--playing-ratio", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--room-timeout", type=float, default=8.0)
+    parser.add_argument("--topology-interval", type=float, default=300.0)
+    parser.add_argument("--adaptive", action="store_true", help="adaptives Polling statt alle Räume je Zyklus")
+    args = parser.parse_args()
+
+    print(f"{'rooms':>6} {'cycles':>7} {'errors':>7} {'p50 s':>8} {'p95 s':>8} {'req/min':>9} {'loop ms':>8}")
+    for n in args.rooms:
+        r = await _run(args, n)
+        print(
+            f"{r['rooms']:>6} {r['cycles']:>7} {r['errors']:>7} {r['p50']:>8.3f} {r['p95']:>8.3f} "
+            f"{r['req_per_min']:>9.0f} {r['max_loop_block_ms']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,216 @@
+"""Lokaler Fake-Controller für die Veoovibes /api/v1 Endpunkte (für Benchmarks/Lasttests).
+
+Unterstützt listrooms, room_player_status, room_play/stop/next/prev, room_vol_set,
+room_repeat und music_room. Spielende Räume melden elapsed/duration, die Position läuft in
+Echtzeit weiter (am Titelende folgt der nächste Titel). Anzahl Räume, Latenz, Jitter und Fehlerraten sind einstellbar.
+
+Standalone: python benchmarks/fake_controller.py --rooms 20 --port 8080
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+
+from aiohttp import web
+
+
+class FakeRoom:
+    __slots__ = (
+        "room_id", "name", "playing", "volume", "repeat", "group", "prog", "track", "_elapsed", "_since",
+    )
+
+    def __init__(self, room_id: int) -> None:
+        self.room_id = room_id
+        self.name = f"Room {room_id}"
+        self.playing = False
+        self.volume = 30
+        self.repeat = False
+        self.group = 1
+        self.prog = 1
+        self.track = 1
+        # Position beim letzten Start/Stopp/Titelwechsel und Zeitpunkt dazu (monotonic)
+        self._elapsed = 0.0
+        self._since = time.monotonic()
+
+    @property
+    def duration(self) -> int:
+        """Titellänge (s), je Raum und Titel unterschiedlich, aber reproduzierbar."""
+        return 120 + (self.room_id * 37 + self.track * 11) % 180
+
+    def _advance(self) -> None:
+        """Spielzeit seit dem letzten Aufruf addieren; am Titelende zum nächsten Titel."""
+        now = time.monotonic()
+        if self.playing:
+            self._elapsed += now - self._since
+            while self._elapsed >= self.duration:
+                self._elapsed -= self.duration
+                self.track += 1
+        self._since = now
+
+    @property
+    def elapsed(self) -> float:
+        self._advance()
+        return self._elapsed
+
+    def set_playing(self, playing: bool) -> None:
+        self._advance()
+        self.playing = playing
+
+    def skip(self, step: int) -> None:
+        self.track = max(1, self.track + step)
+        self._elapsed = 0.0
+        self._since = time.monotonic()
+
+    def status(self) -> dict:
+        progress = {"elapsed": int(self.elapsed), "duration": self.duration} if self.playing else {}
+        return {
+            "room": str(self.room_id),
+            "is_playing": 1 if self.playing else 0,
+            "status_code": "playing" if self.playing else "stopped",
+            "zone_volume": self.volume,
+            "repeat": 1 if self.repeat else 0,
+            "title": f"Track {self.track}" if self.playing else None,
+            "artist": "Fake Artist" if self.playing else None,
+            "album": "Fake Album" if self.playing else None,
+            "radio_name": f"Station {self.group}/{self.prog}",
+            "cover": None,
+            "group": self.group,
+            "prog": self.prog,
+            **progress,
+        }
+
+
+class FakeController:
+    """aiohttp-App mit zustandsbehafteten Räumen und künstlicher Latenz/Fehlern.
+
+    failure_rate: Anteil der Requests mit HTTP 500.
+    api_failure_rate: Anteil der Requests mit {"status": "failed"}.
+    failing_rooms: Raum-IDs, deren Requests immer mit HTTP 500 antworten.
+    """
+
+    def __init__(
+        self,
+        rooms: int = 10,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        api_failure_rate: float = 0.0,
+        playing_ratio: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        self._rng = random.Random(seed)
+        self.rooms = {i: FakeRoom(i) for i in range(1, rooms + 1)}
+        for room in self.rooms.values():
+            room.playing = self._rng.random() < playing_ratio
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.api_failure_rate = api_failure_rate
+        self.failing_rooms: set[int] = set()
+        self.requests = 0
+        self.requests_by_cmd: Counter = Counter()
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    def reset_counters(self) -> None:
+        self.requests = 0
+        self.requests_by_cmd.clear()
+
+    @staticmethod
+    def _ok(result) -> web.Response:
+        return web.json_response({"status": "succeeded", "code": 0, "result": result})
+
+    @staticmethod
+    def _failed(msg: str) -> web.Response:
+        return web.json_response({"status": "failed", "code": 1, "result": msg})
+
+    def _room(self, request: web.Request) -> FakeRoom | None:
+        try:
+            return self.rooms.get(int(request.query.get("room", "")))
+        except ValueError:
+            return None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        cmd = request.match_info["cmd"]
+        self.requests += 1
+        self.requests_by_cmd[cmd] += 1
+        delay = self.latency + self._rng.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._rng.random() < self.failure_rate:
+            raise web.HTTPInternalServerError()
+        room = self._room(request)
+        if room is not None and room.room_id in self.failing_rooms:
+            raise web.HTTPInternalServerError()
+        if self._rng.random() < self.api_failure_rate:
+            return self._failed("simulated failure")
+
+        if cmd == "listrooms":
+            return self._ok(
+                {str(r.room_id): {"id_room": r.room_id, "name": r.name} for r in self.rooms.values()}
+            )
+        if room is None:
+            return self._failed("unknown room")
+        if cmd == "room_player_status":
+            return self._ok(room.status())
+        if cmd == "room_play":
+            room.set_playing(True)
+        elif cmd == "room_stop":
+            room.set_playing(False)
+        elif cmd == "room_next":
+            room.skip(1)
+        elif cmd == "room_prev":
+            room.skip(-1)
+        elif cmd == "room_vol_set":
+            room.volume = max(0, min(100, int(request.query.get("vol", room.volume))))
+        elif cmd == "room_repeat":
+            room.repeat = not room.repeat
+        elif cmd == "music_room":
+            room.group = int(request.query.get("group", room.group))
+            room.prog = int(request.query.get("prog", room.prog))
+            room.skip(0)
+            room.set_playing(True)
+        else:
+            return self._failed(f"unknown command {cmd}")
+        return self._ok(None)
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/v1/{cmd}", self._handle)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--api-failure-rate", type=float, default=0.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    fake = FakeController(
+        args.rooms, args.latency, args.jitter, args.failure_rate, args.api_failure_rate
+    )
+    web.run_app(fake.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
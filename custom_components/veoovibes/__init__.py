@@ -1,153 +1,405 @@
 from __future__ import annotations
 from datetime import timedelta
+from functools import lru_cache
 import logging
-import json
+import os
+import shutil
 import yaml
 from pathlib import Path
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
     DOMAIN,
+    PLATFORMS,
+    DATA_CLIENT_MANAGER,
     CONF_BASE_URL,
     CONF_TOKEN,
     CONF_VERIFY_SSL,
     DEFAULT_VERIFY_SSL,
-    DEFAULT_SCAN_INTERVAL,
+    CONF_ACTIVE_INTERVAL,
+    CONF_IDLE_INTERVAL,
+    CONF_IDLE_MAX_INTERVAL,
+    DEFAULT_ACTIVE_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    DEFAULT_IDLE_MAX_INTERVAL,
+    CONF_MAX_CONCURRENCY,
+    CONF_ROOM_TIMEOUT,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_ROOM_TIMEOUT,
+    CONF_CONNECT_TIMEOUT,
+    CONF_READ_TIMEOUT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    CONF_ARTWORK_THUMBNAIL_SIZE,
+    DEFAULT_ARTWORK_THUMBNAIL_SIZE,
+    ARTWORK_CACHE_DIR,
+    CONF_TOPOLOGY_INTERVAL,
+    DEFAULT_TOPOLOGY_INTERVAL,
     KEY_ROOMS,
     KEY_STATE,
+    STORAGE_VERSION,
+    STORAGE_KEY,
+    SNAPSHOT_SAVE_DELAY,
     CONF_SOURCE_MAP,  # NEU: Schlüssel für Options-/Datei-Konfiguration
+    SOURCE_FILE,
+    SOURCE_FILE_CHECK_INTERVAL,
 )
 from .api import VeoovibesClient, VeoovibesApiError
+from .topology import RoomTopologyCache
+from .scheduler import AdaptivePollScheduler
+from .sources import SourceIndex, parse_source_map, sources_from_data
+from .metrics import PollMetrics
+from .poller import RoomPoller
+from .artwork import ArtworkCache
+from .browse_media import BrowseCache
+from .model import SNAPSHOT_FIELDS, RoomStatus
+from .client_manager import ClientManager
+from .services import async_setup_services, async_unload_services
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def _parse_global_sources(raw: str) -> list[dict]:
+def _sources_from_data(data, origin: str) -> tuple[dict, ...]:
+    sources, problems = sources_from_data(data)
+    for problem in problems:
+        _LOGGER.warning("veoovibes: %s: %s", origin, problem)
+    return sources
+
+
+@lru_cache(maxsize=8)
+def _parse_global_sources(raw: str) -> tuple[dict, ...]:
     """YAML/JSON parsen:
     sources:
       - name: "FM4"
         group: 1
         prog: 3
-    -> Liste von Dicts mit name/group/prog.
+    -> Tupel von Dicts mit name/group/prog (gecacht je Options-String, nicht verändern).
+    Ungültige Einträge werden übersprungen und einmal je Options-String geloggt.
     """
-    if not raw or not str(raw).strip():
-        return []
-    data = None
-    try:
-        data = yaml.safe_load(raw)
-    except Exception:
-        try:
-            data = json.loads(raw)
-        except Exception as exc:
-            _LOGGER.warning("veoovibes: source_map parse error: %s", exc)
-            return []
-    if not isinstance(data, dict):
-        return []
-    out: list[dict] = []
-    for s in (data.get("sources") or []):
-        try:
-            out.append(
-                {"name": str(s["name"]), "group": int(s["group"]), "prog": int(s["prog"])}
-            )
-        except Exception:
-            continue
-    return out
+    sources, problems = parse_source_map(raw)
+    for problem in problems:
+        _LOGGER.warning("veoovibes: source_map: %s", problem)
+    return sources
+
+
+# Datei-Cache: Pfad -> ((mtime_ns, size), Quellen)
+_SOURCE_FILE_CACHE: dict[str, tuple[tuple[int, int], tuple[dict, ...]]] = {}
+
 
+def _load_sources_from_file(path: str) -> tuple[dict, ...]:
+    """Optionaler Fallback: /config/veoovibes_sources.yaml laden (blockierend, im Executor aufrufen).
 
-def _load_sources_from_file(hass) -> list[dict]:
-    """Optionaler Fallback: /config/veoovibes_sources.yaml laden."""
+    Parst nur neu, wenn sich mtime/Größe geändert haben. Der Cache ist modulweit; ob sich die
+    Quellen für einen Eintrag geändert haben, entscheidet _set_global_sources je Eintrag.
+    """
+    cached = _SOURCE_FILE_CACHE.get(path)
     try:
-        path = Path(hass.config.path("veoovibes_sources.yaml"))
-        if not path.exists():
-            return []
-        data = yaml.safe_load(path.read_text(encoding="utf-8"))
-        if not isinstance(data, dict):
-            return []
-        out: list[dict] = []
-        for s in (data.get("sources") or []):
-            try:
-                out.append(
-                    {"name": str(s["name"]), "group": int(s["group"]), "prog": int(s["prog"])}
-                )
-            except Exception:
-                continue
-        return out
+        st = os.stat(path)
+    except FileNotFoundError:
+        _SOURCE_FILE_CACHE.pop(path, None)
+        return ()
+    except OSError as exc:
+        _LOGGER.warning("veoovibes: could not load veoovibes_sources.yaml: %s", exc)
+        return cached[1] if cached else ()
+    key = (st.st_mtime_ns, st.st_size)
+    if cached and cached[0] == key:
+        return cached[1]
+    try:
+        data = yaml.safe_load(Path(path).read_text(encoding="utf-8"))
     except Exception as exc:
         _LOGGER.warning("veoovibes: could not load veoovibes_sources.yaml: %s", exc)
-        return []
+        data = None
+    sources = _sources_from_data(data, SOURCE_FILE)
+    _SOURCE_FILE_CACHE[path] = (key, sources)
+    return sources
+
+
+async def _async_global_sources(hass: HomeAssistant, entry: ConfigEntry) -> tuple[dict, ...]:
+    """Globale Quellen: erst Optionswert, sonst Datei-Fallback (Datei-I/O im Executor)."""
+    sources = _parse_global_sources(entry.options.get(CONF_SOURCE_MAP, ""))
+    if sources:
+        return sources
+    return await hass.async_add_executor_job(
+        _load_sources_from_file, hass.config.path(SOURCE_FILE)
+    )
+
+
+def _set_global_sources(data: dict, sources: tuple[dict, ...]) -> bool:
+    """Quellen übernehmen und den Index nur bei Änderung neu aufbauen."""
+    if "source_index" in data and data.get("global_sources") == sources:
+        return False
+    data["global_sources"] = sources
+    data["source_index"] = SourceIndex(sources)
+    return True
+
+
+def _poll_intervals(entry: ConfigEntry) -> tuple[float, float, float]:
+    """(active, idle, idle_max) aus den Optionen."""
+    return (
+        entry.options.get(CONF_ACTIVE_INTERVAL, DEFAULT_ACTIVE_INTERVAL),
+        entry.options.get(CONF_IDLE_INTERVAL, DEFAULT_IDLE_INTERVAL),
+        entry.options.get(CONF_IDLE_MAX_INTERVAL, DEFAULT_IDLE_MAX_INTERVAL),
+    )
+
+
+def _room_timeout(entry: ConfigEntry) -> float:
+    """Timeout je Raum, mindestens Verbindungs- + Lese-Timeout (ältere Optionen waren kürzer)."""
+    return max(
+        entry.options.get(CONF_ROOM_TIMEOUT, DEFAULT_ROOM_TIMEOUT),
+        entry.options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)
+        + entry.options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+    )
+
+
+def _snapshot_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    return Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}")
+
+
+def _snapshot_payload(data: dict) -> dict:
+    """Coordinator-Daten in die gespeicherte Form bringen: Räume + Status ohne Position/Dauer."""
+    return {
+        "rooms": data[KEY_ROOMS],
+        "state": {
+            rid: {k: v for k, v in st.raw.items() if k in SNAPSHOT_FIELDS}
+            for rid, st in data[KEY_STATE].items()
+        },
+    }
+
+
+def _snapshot_signature(data: dict) -> tuple:
+    """Günstiger Vergleichswert für _snapshot_payload (ändert sich nicht mit der Spielposition)."""
+    return (
+        tuple((r.get("key"), r.get("name")) for r in data[KEY_ROOMS]),
+        tuple((rid, st.snapshot_key()) for rid, st in data[KEY_STATE].items()),
+    )
+
+
+def _snapshot_from_storage(stored) -> dict | None:
+    """Gespeicherten Snapshot in Coordinator-Daten umwandeln (Status als stale markiert)."""
+    if not isinstance(stored, dict) or not isinstance(stored.get("rooms"), list) or not stored["rooms"]:
+        return None
+    states = stored.get("state") if isinstance(stored.get("state"), dict) else {}
+    return {
+        KEY_ROOMS: stored["rooms"],
+        KEY_STATE: {rid: RoomStatus.from_payload(raw, stale=True) for rid, raw in states.items()},
+    }
+
+
+def _client_manager(hass: HomeAssistant) -> ClientManager:
+    """Geteilter Manager für alle Einträge (Session/Limiter je Host, gemeinsamer Poll-Takt)."""
+    manager = hass.data.get(DATA_CLIENT_MANAGER)
+    if manager is None:
+        manager = hass.data[DATA_CLIENT_MANAGER] = ClientManager(hass.async_create_background_task)
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, manager.async_close)
+    return manager
+
+
+async def _async_release_client(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    manager: ClientManager | None = hass.data.get(DATA_CLIENT_MANAGER)
+    if manager is None:
+        return
+    manager.scheduler.unregister(entry.entry_id)
+    await manager.release(entry.data[CONF_BASE_URL])
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
-    session = async_get_clientsession(hass)
+    manager = _client_manager(hass)
     base = entry.data[CONF_BASE_URL]
-    api_key = entry.data.get(CONF_TOKEN)
-    verify = entry.data.get(CONF_VERIFY_SSL, DEFAULT_VERIFY_SSL)
-
-    client = VeoovibesClient(base, api_key, verify, session)
-
-    async def _update():
-        rooms = await client.list_rooms()
-        state_by_room: dict[str, dict] = {}
-        for r in rooms:
-            rid = r.get("id_room") or r.get("api_room_id") or r.get("key")
-            if rid is None:
-                continue
+    session, rate_limiter = manager.acquire(base)
+    client: VeoovibesClient | None = None
+    try:
+        api_key = entry.data.get(CONF_TOKEN)
+        verify = entry.data.get(CONF_VERIFY_SSL, DEFAULT_VERIFY_SSL)
+
+        client = VeoovibesClient(
+            base,
+            api_key,
+            verify,
+            session,
+            connect_timeout=entry.options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+            read_timeout=entry.options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+            rate_limiter=rate_limiter,
+            create_task=manager.create_task,
+        )
+        topology = RoomTopologyCache(
+            client, entry.options.get(CONF_TOPOLOGY_INTERVAL, DEFAULT_TOPOLOGY_INTERVAL)
+        )
+        scheduler = AdaptivePollScheduler(*_poll_intervals(entry))
+        poll_metrics = PollMetrics()
+
+        artwork = ArtworkCache(
+            session,
+            hass.config.path(".cache", ARTWORK_CACHE_DIR),
+            verify,
+            entry.options.get(CONF_ARTWORK_THUMBNAIL_SIZE, DEFAULT_ARTWORK_THUMBNAIL_SIZE),
+            add_executor_job=hass.async_add_executor_job,
+        )
+        poller = RoomPoller(
+            client,
+            topology,
+            scheduler,
+            poll_metrics,
+            max_concurrency=entry.options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+            room_timeout=_room_timeout(entry),
+        )
+
+        async def _update():
             try:
-                # in Deinem Client heißt der Status-Endpunkt get_room_status
-                state_by_room[str(rid)] = await client.get_room_status(rid)
+                return await poller.async_poll(coordinator.data)
             except VeoovibesApiError as exc:
-                _LOGGER.debug("room_player_status failed for %s: %s", rid, exc)
-        return {KEY_ROOMS: rooms, KEY_STATE: state_by_room}
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name="veoovibes",
-        update_method=_update,
-        update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
-    )
+                raise UpdateFailed(str(exc)) from exc
 
-    await coordinator.async_config_entry_first_refresh()
+        coordinator = DataUpdateCoordinator(
+            hass,
+            _LOGGER,
+            name="veoovibes",
+            update_method=_update,
+            # kein eigener Timer: der gemeinsame Poll-Takt des ClientManagers löst die Refreshes aus
+            update_interval=None,
+        )
 
-    # Globale Quellen: erst Optionswert, sonst Datei-Fallback
-    global_sources = _parse_global_sources(entry.options.get(CONF_SOURCE_MAP, "")) or _load_sources_from_file(hass)
+        store = _snapshot_store(hass, entry)
+        snapshot = _snapshot_from_storage(await store.async_load())
+        if snapshot is not None:
+            # Entities sofort aus dem Snapshot anlegen, echter Refresh läuft im Hintergrund
+            topology.seed(snapshot[KEY_ROOMS])
+            coordinator.async_set_updated_data(snapshot)
+            entry.async_create_background_task(
+                hass, coordinator.async_refresh(), f"{DOMAIN} initial refresh {entry.entry_id}"
+            )
+        else:
+            await coordinator.async_config_entry_first_refresh()
 
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {
-        "client": client,
-        "coordinator": coordinator,
-        "global_sources": global_sources,                       # NEU
-        "unsub_options": entry.add_update_listener(options_updated),  # NEU
-    }
+        # Nur bei Änderung speichern und einen laufenden Timer nicht verlängern: async_delay_save
+        # verschiebt das Schreiben bei jedem Aufruf, der 2-s-Takt würde es sonst bis zum Beenden aufschieben
+        snapshot_state = {
+            "saved": _snapshot_signature(snapshot) if snapshot is not None else None,
+            "pending": False,
+        }
 
-    await hass.config_entries.async_forward_entry_setups(entry, [Platform.MEDIA_PLAYER])
-    return True
+        @callback
+        def _snapshot_data() -> dict:
+            snapshot_state["pending"] = False
+            snapshot_state["saved"] = _snapshot_signature(coordinator.data)
+            return _snapshot_payload(coordinator.data)
+
+        @callback
+        def _schedule_snapshot_save() -> None:
+            if snapshot_state["pending"] or not coordinator.last_update_success or not coordinator.data:
+                return
+            if _snapshot_signature(coordinator.data) == snapshot_state["saved"]:
+                return
+            snapshot_state["pending"] = True
+            store.async_delay_save(_snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+        entry.async_on_unload(coordinator.async_add_listener(_schedule_snapshot_save))
+        # Takt = schnellstes Intervall; welche Räume abgefragt werden, entscheidet der Scheduler
+        manager.scheduler.register(entry.entry_id, coordinator.async_refresh, scheduler.active_interval)
+
+        # Globale Quellen: erst Optionswert, sonst Datei-Fallback
+        global_sources = await _async_global_sources(hass, entry)
+
+        hass.data.setdefault(DOMAIN, {})
+        hass.data[DOMAIN][entry.entry_id] = {
+            "client": client,
+            "coordinator": coordinator,
+            "topology": topology,
+            "scheduler": scheduler,
+            "poll_metrics": poll_metrics,
+            "poller": poller,
+            "artwork": artwork,
+            "browse_cache": BrowseCache(),
+            "store": store,
+            "snapshot": snapshot_state,
+            "unsub_options": entry.add_update_listener(options_updated),  # NEU
+        }
+        _set_global_sources(hass.data[DOMAIN][entry.entry_id], global_sources)
+
+        async def _check_source_file(now=None) -> None:
+            """Änderungen an veoovibes_sources.yaml ohne Reload übernehmen."""
+            data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+            if not data:
+                return
+            sources = await _async_global_sources(hass, entry)
+            if _set_global_sources(data, sources):
+                _LOGGER.debug("veoovibes: %s changed, %d sources", SOURCE_FILE, len(sources))
+                coordinator.async_update_listeners()
+
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, _check_source_file, timedelta(seconds=SOURCE_FILE_CHECK_INTERVAL)
+            )
+        )
+
+        async_setup_services(hass)
+
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        return True
+    except Exception:
+        # Session-Referenz und Poll-Registrierung nicht verwaisen lassen
+        data = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        if data:
+            data["unsub_options"]()
+        if client is not None:
+            client.close()
+        await _async_release_client(hass, entry)
+        if DOMAIN in hass.data and not hass.data[DOMAIN]:
+            async_unload_services(hass)
+        raise
 
 
 async def options_updated(hass: HomeAssistant, entry: ConfigEntry):
-    """Wenn Optionen geändert wurden: globale Quellen neu laden (mit Datei-Fallback)."""
+    """Wenn Optionen geändert wurden: globale Quellen (mit Datei-Fallback) und Polling-Intervalle neu setzen."""
     data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
     if not data:
         return
-    data["global_sources"] = (
-        _parse_global_sources(entry.options.get(CONF_SOURCE_MAP, "")) or _load_sources_from_file(hass)
+    sources = await _async_global_sources(hass, entry)
+    _set_global_sources(data, sources)
+    data["scheduler"].configure(*_poll_intervals(entry))
+    data["poller"].max_concurrency = entry.options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+    data["poller"].room_timeout = _room_timeout(entry)
+    data["artwork"].thumbnail_size = entry.options.get(
+        CONF_ARTWORK_THUMBNAIL_SIZE, DEFAULT_ARTWORK_THUMBNAIL_SIZE
     )
+    data["topology"].interval = entry.options.get(CONF_TOPOLOGY_INTERVAL, DEFAULT_TOPOLOGY_INTERVAL)
+    _client_manager(hass).scheduler.set_interval(entry.entry_id, data["scheduler"].active_interval)
+    data["client"].connect_timeout = entry.options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)
+    data["client"].read_timeout = entry.options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT)
     await data["coordinator"].async_request_refresh()
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, [Platform.MEDIA_PLAYER])
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if data:
+            data["client"].close()
+            await _async_release_client(hass, entry)
+            # ausstehenden Snapshot sofort schreiben (Reload/Entfernen wartet nicht auf den Timer)
+            if data["snapshot"]["pending"] and data["coordinator"].data:
+                data["snapshot"]["pending"] = False
+                await data["store"].async_save(_snapshot_payload(data["coordinator"].data))
         # Options-Listener deregistrieren, wenn vorhanden
         if data and callable(data.get("unsub_options")):
             try:
                 data["unsub_options"]()
             except Exception:  # noqa: BLE001
                 pass
+        if not hass.data[DOMAIN]:
+            async_unload_services(hass)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Gespeicherten Snapshot und (beim letzten Eintrag) den Cover-Cache löschen."""
+    await _snapshot_store(hass, entry).async_remove()
+    if not any(e.entry_id != entry.entry_id for e in hass.config_entries.async_entries(DOMAIN)):
+        await hass.async_add_executor_job(
+            shutil.rmtree, hass.config.path(".cache", ARTWORK_CACHE_DIR), True
+        )
@@ -1,24 +1,88 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
+import asyncio
 import aiohttp
 import async_timeout
+import json
 import logging
+import random
+import time
+
+from .const import MAX_IN_FLIGHT as DEFAULT_MAX_IN_FLIGHT
+from .metrics import RequestMetrics
+from .model import ROOM_FIELDS, STATUS_FIELDS
+from .request_queue import RequestScheduler, PRIORITY_COMMAND, PRIORITY_POLL
+
+try:  # schnellerer Decoder, falls vorhanden (in Home Assistant enthalten)
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
 
 _LOGGER = logging.getLogger(__name__)
 
 BASE = "/api/v1"
 
+# Lesende Endpunkte, die gefahrlos wiederholt werden dürfen
+IDEMPOTENT_CMDS = frozenset({"listrooms", "room_player_status"})
+
 class VeoovibesApiError(Exception):
     pass
 
+class VeoovibesUnavailableError(VeoovibesApiError):
+    """Controller gilt als nicht erreichbar (Circuit Breaker offen), Request wurde nicht gesendet."""
+
 class VeoovibesClient:
     """Async client for Veoovibes HTTP API (documented command endpoints)."""
 
-    def __init__(self, base_url: str, api_key: Optional[str], verify_ssl: bool, session: aiohttp.ClientSession):
+    CONNECT_TIMEOUT = 5  # seconds
+    READ_TIMEOUT = 10  # seconds
+    READ_RETRIES = 2  # zusätzliche Versuche für IDEMPOTENT_CMDS
+    RETRY_BACKOFF = 0.5  # seconds, verdoppelt sich je Versuch (+ Jitter)
+    # Circuit Breaker: nach so vielen fehlgeschlagenen Requests in Folge (je Request, nach allen
+    # Wiederholungen) sofort abweisen
+    FAILURE_THRESHOLD = 3
+    PROBE_INTERVAL = 5  # seconds, erster Hintergrund-Probe
+    PROBE_MAX_INTERVAL = 60  # seconds
+    MAX_IN_FLIGHT = DEFAULT_MAX_IN_FLIGHT  # gleichzeitige Requests an den Controller
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str],
+        verify_ssl: bool,
+        session: aiohttp.ClientSession,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        read_retries: int = READ_RETRIES,
+        rate_limiter=None,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        create_task=None,
+    ):
         self._base = base_url.rstrip("/")
         self._api_key = api_key
         self._verify_ssl = verify_ssl
         self._session = session
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.read_retries = read_retries
+        self._failures = 0
+        self._circuit_open = False
+        self._probe_task: Optional[asyncio.Task] = None
+        # optional: Task-Factory (coro, name) -> Task, z. B. hass.async_create_background_task
+        self._create_task = create_task
+        self.metrics = RequestMetrics()
+        # optional: geteilter Limiter je Host (siehe client_manager.HostRateLimiter)
+        self._rate_limiter = rate_limiter
+        # Befehle vor Hintergrund-Polls, FIFO je Raum, In-Flight-Limit
+        self.queue = RequestScheduler(max_in_flight)
+        # Lautstärke je Raum: höchstens ein Befehl unterwegs, währenddessen nur der neueste Wert wartet
+        self._volume_locks: Dict[str, asyncio.Lock] = {}
+        self._volume_seq: Dict[str, int] = {}
+        self.command_stats: Dict[str, int] = {"volume_sent": 0, "volume_coalesced": 0}
+        # Diagnose: alle je Endpunkt gesehenen Feldnamen und das letzte unveränderte Beispiel
+        # (Status/Räume werden sonst auf die gelesenen Felder reduziert)
+        self.raw_keys: Dict[str, set] = {}
+        self.raw_samples: Dict[str, Any] = {}
 
     def _params(self, extra: Optional[dict] = None) -> Dict[str, Any]:
         p: Dict[str, Any] = {}
@@ -28,19 +92,125 @@ class VeoovibesClient:
             p.update(extra)
         return p
 
-    async def _get_cmd(self, cmd: str, params: Optional[dict] = None) -> Any:
+    @property
+    def available(self) -> bool:
+        """False, solange der Circuit Breaker offen ist."""
+        return not self._circuit_open
+
+    async def _request(self, cmd: str, params: Optional[dict] = None) -> Any:
         url = f"{self._base}{BASE}/{cmd}"
+        timeout = aiohttp.ClientTimeout(
+            total=self.connect_timeout + self.read_timeout,
+            connect=self.connect_timeout,
+            sock_read=self.read_timeout,
+        )
+        start = time.monotonic()
+        size = 0
+        ok = False
         try:
-            async with async_timeout.timeout(15):
-                async with self._session.get(url, params=self._params(params), ssl=self._verify_ssl) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-            if data.get("status") != "succeeded" or str(data.get("code")) != "0":
-                raise VeoovibesApiError(f"{cmd} failed: {data}")
-            return data.get("result")
-        except Exception as exc:
-            raise VeoovibesApiError(f"{cmd} error: {exc}") from exc
-    
+            async with self._session.get(
+                url, params=self._params(params), ssl=self._verify_ssl, timeout=timeout
+            ) as resp:
+                resp.raise_for_status()
+                body = await resp.read()
+            size = len(body)
+            data = _json_loads(body)
+            ok = isinstance(data, dict) and data.get("status") == "succeeded"
+            return data
+        finally:
+            self.metrics.record(cmd, time.monotonic() - start, ok, size)
+
+    async def _throttle(self) -> None:
+        """Token des Host-Limiters holen, bevor ein Slot der Queue belegt wird (sonst blockiert die
+        Wartezeit einen In-Flight-Platz und hält Befehle hinter gedrosselten Polls fest)."""
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
+
+    @staticmethod
+    def _is_transport_error(exc: Exception) -> bool:
+        """Netzwerk-/Timeout-Fehler und HTTP 5xx zählen für Retry und Circuit Breaker."""
+        if isinstance(exc, aiohttp.ClientResponseError):
+            return exc.status >= 500
+        return isinstance(exc, (aiohttp.ClientError, asyncio.TimeoutError, OSError))
+
+    @staticmethod
+    def _is_connection_error(exc: Exception) -> bool:
+        """Verbindung nicht möglich/abgebrochen: betrifft den ganzen Controller (Circuit Breaker).
+
+        Timeouts zählen nicht dazu: bei raumbezogenen Requests kann auch nur ein Raum hängen.
+        """
+        if isinstance(exc, asyncio.TimeoutError):
+            return False
+        return isinstance(exc, (aiohttp.ClientConnectionError, OSError))
+
+    async def _get_cmd(self, cmd: str, params: Optional[dict] = None, priority: Optional[int] = None) -> Any:
+        if self._circuit_open:
+            raise VeoovibesUnavailableError(f"{cmd} skipped: controller unavailable")
+        idempotent = cmd in IDEMPOTENT_CMDS
+        if priority is None:
+            priority = PRIORITY_POLL if idempotent else PRIORITY_COMMAND
+        room = str(params["room"]) if params and "room" in params else None
+        attempts = 1 + (self.read_retries if idempotent else 0)
+        for attempt in range(attempts):
+            try:
+                await self._throttle()
+                async with self.queue.slot(priority, room):
+                    data = await self._request(cmd, params)
+            except Exception as exc:
+                if not self._is_transport_error(exc):
+                    raise VeoovibesApiError(f"{cmd} error: {exc}") from exc
+                if attempt + 1 < attempts and not self._circuit_open:
+                    delay = self.RETRY_BACKOFF * (2 ** attempt)
+                    await asyncio.sleep(delay + random.uniform(0, delay))
+                    continue
+                if room is None or self._is_connection_error(exc):
+                    self._record_failure()
+                elif isinstance(exc, aiohttp.ClientResponseError):
+                    # 5xx für einen einzelnen Raum: der Controller antwortet, nur der Raum klemmt
+                    self._record_success()
+                # Timeout eines einzelnen Raums: nur dieser Raum gilt als veraltet
+                raise VeoovibesApiError(f"{cmd} error: {exc}") from exc
+            self._record_success()
+            return self._check_result(cmd, data)
+
+    # ----- Circuit Breaker -----
+    def _record_success(self) -> None:
+        self._failures = 0
+        if self._circuit_open:
+            self._circuit_open = False
+            _LOGGER.info("veoovibes controller %s reachable again", self._base)
+
+    def _record_failure(self) -> None:
+        self._failures += 1
+        if not self._circuit_open and self._failures >= self.FAILURE_THRESHOLD:
+            self._circuit_open = True
+            _LOGGER.warning("veoovibes controller %s unreachable, pausing requests", self._base)
+            if self._probe_task is None or self._probe_task.done():
+                if self._create_task is not None:
+                    self._probe_task = self._create_task(self._probe(), f"veoovibes probe {self._base}")
+                else:
+                    self._probe_task = asyncio.create_task(self._probe())
+
+    async def _probe(self) -> None:
+        """Im Hintergrund prüfen, ob der Controller wieder antwortet (mit Backoff)."""
+        interval = self.PROBE_INTERVAL
+        while self._circuit_open:
+            await asyncio.sleep(interval + random.uniform(0, interval / 2))
+            try:
+                await self._throttle()
+                await self._request("listrooms")
+            except Exception as exc:  # noqa: BLE001
+                _LOGGER.debug("veoovibes probe failed: %s", exc)
+                interval = min(interval * 2, self.PROBE_MAX_INTERVAL)
+                continue
+            self._record_success()
+
+    def close(self) -> None:
+        """Hintergrund-Probe beenden (beim Entladen des Eintrags)."""
+        if self._probe_task is not None and not self._probe_task.done():
+            self._probe_task.cancel()
+        self._probe_task = None
+
     async def room_repeat(self, room_id: int | str):
         """Repeat als Toggle."""
         return await self._get_cmd("room_repeat", {"room": room_id})
@@ -51,26 +221,96 @@ class VeoovibesClient:
             "music_room", {"room": room_id, "group": int(group), "prog": int(prog)}
         )
 
+    @staticmethod
+    def _check_result(cmd: str, data: Any) -> Any:
+        """status/code prüfen, bevor irgendetwas aus dem Ergebnis gelesen wird."""
+        if not isinstance(data, dict):
+            raise VeoovibesApiError(f"{cmd} error: unexpected response {type(data).__name__}")
+        if data.get("status") != "succeeded" or str(data.get("code")) != "0":
+            raise VeoovibesApiError(f"{cmd} failed: status={data.get('status')} code={data.get('code')}")
+        return data.get("result")
+
     @staticmethod
     def _dict_result_to_list(d: Any) -> List[dict]:
         # listrooms -> result is an object: { "95": {...}, "91": {...} }
+        # Nur benötigte Felder in ein kleines Dict übernehmen (kein Kopieren/Mutieren des Originals)
         if not isinstance(d, dict):
             return []
         out: List[dict] = []
         for key, val in d.items():
             if isinstance(val, dict):
-                val.setdefault("key", key)
-                out.append(val)
+                room = {f: val[f] for f in ROOM_FIELDS if f in val}
+                room["key"] = key
+                out.append(room)
         return out
 
+    @staticmethod
+    def _lean_status(d: Any) -> dict:
+        """room_player_status auf die von RoomStatus gelesenen Felder reduzieren."""
+        if not isinstance(d, dict):
+            return {}
+        return {k: v for k, v in d.items() if k in STATUS_FIELDS}
+
+    def _remember_raw(self, cmd: str, payloads: Iterable[Any]) -> None:
+        keys = self.raw_keys.setdefault(cmd, set())
+        for payload in payloads:
+            if isinstance(payload, dict):
+                keys.update(payload)
+                self.raw_samples[cmd] = payload
+
+    def raw_diagnostics(self) -> Dict[str, dict]:
+        return {
+            cmd: {"keys": sorted(keys), "sample": self.raw_samples.get(cmd)}
+            for cmd, keys in self.raw_keys.items()
+        }
+
     # Discovery
     async def list_rooms(self) -> List[dict]:
         result = await self._get_cmd("listrooms")
+        if isinstance(result, dict):
+            self._remember_raw("listrooms", result.values())
         return self._dict_result_to_list(result)
 
     # Status
-    async def get_room_status(self, room_id: str | int) -> dict:
-        return await self._get_cmd("room_player_status", {"room": room_id})
+    async def get_room_status(self, room_id: str | int, priority: int = PRIORITY_POLL) -> dict:
+        """priority=PRIORITY_COMMAND für den Refresh direkt nach einem Benutzerbefehl."""
+        result = await self._get_cmd("room_player_status", {"room": room_id}, priority)
+        self._remember_raw("room_player_status", (result,))
+        return self._lean_status(result)
+
+    async def get_room_statuses(
+        self,
+        room_ids: Iterable[str | int],
+        max_concurrency: int = 1,
+        room_timeout: Optional[float] = None,
+    ) -> Dict[str, dict]:
+        """room_player_status für mehrere Räume parallel (max. max_concurrency gleichzeitig).
+
+        Räume, die fehlschlagen oder länger als room_timeout brauchen, fehlen im Ergebnis; das
+        zählt (wie 5xx eines Raums) nicht für den Circuit Breaker.
+        """
+        sem = asyncio.Semaphore(max(1, int(max_concurrency)))
+
+        async def _one(rid: str | int) -> dict:
+            async with sem:
+                if room_timeout:
+                    async with async_timeout.timeout(room_timeout):
+                        return await self.get_room_status(rid)
+                return await self.get_room_status(rid)
+
+        ids = [str(rid) for rid in room_ids]
+        results = await asyncio.gather(*(_one(rid) for rid in ids), return_exceptions=True)
+        out: Dict[str, dict] = {}
+        for rid, res in zip(ids, results):
+            if isinstance(res, asyncio.TimeoutError):
+                _LOGGER.debug("room_player_status timed out for %s", rid)
+            elif isinstance(res, VeoovibesApiError):
+                _LOGGER.debug("room_player_status failed for %s: %s", rid, res)
+            elif isinstance(res, BaseException):
+                raise res
+            else:
+                out[rid] = res
+        return out
 
     # Controls (room)
     async def play_room(self, room_id: str | int) -> None:
@@ -85,6 +325,21 @@ class VeoovibesClient:
     async def prev_room(self, room_id: str | int) -> None:
         await self._get_cmd("room_prev", {"room": room_id})
 
-    async def set_room_volume(self, room_id: str | int, vol_0_100: int) -> None:
+    async def set_room_volume(self, room_id: str | int, vol_0_100: int) -> bool:
+        """Lautstärke setzen. Der erste Wert geht sofort raus; Werte, die eintreffen, während für
+        denselben Raum noch gesendet wird, werden zusammengefasst: nur der neueste folgt danach (True),
+        die übrigen liefern False.
+        """
         vol = max(0, min(100, int(vol_0_100)))
-        await self._get_cmd("room_vol_set", {"room": room_id, "vol": vol})
+        key = str(room_id)
+        seq = self._volume_seq.get(key, 0) + 1
+        self._volume_seq[key] = seq
+        lock = self._volume_locks.setdefault(key, asyncio.Lock())
+        # asyncio.Lock ist FIFO: Wartende kommen in Aufrufreihenfolge dran
+        async with lock:
+            if self._volume_seq[key] != seq:
+                self.command_stats["volume_coalesced"] += 1
+                return False
+            await self._get_cmd("room_vol_set", {"room": room_id, "vol": vol})
+        self.command_stats["volume_sent"] += 1
+        return True
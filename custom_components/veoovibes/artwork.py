@@ -0,0 +1,216 @@
+"""Cover-Proxy mit LRU-Cache im Speicher und auf der Platte.
+
+Cover werden einmal vom Controller geladen (auch bei selbstsigniertem HTTPS) und danach aus dem
+Cache ausgeliefert. Nach REVALIDATE_AFTER Sekunden wird per If-None-Match/If-Modified-Since
+nachgefragt. Optional werden Bilder auf eine Thumbnail-Größe verkleinert (benötigt Pillow).
+"""
+from __future__ import annotations
+import asyncio
+from collections import OrderedDict
+import hashlib
+import io
+import json
+import logging
+import os
+import time
+from typing import Optional, Tuple
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Artwork:
+    __slots__ = ("content", "content_type", "etag", "last_modified", "checked")
+
+    def __init__(self, content: bytes, content_type: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        self.content = content
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.checked = time.monotonic()
+
+    def meta(self) -> dict:
+        return {"content_type": self.content_type, "etag": self.etag, "last_modified": self.last_modified}
+
+
+def _thumbnail(content: bytes, size: int) -> Tuple[bytes, str]:
+    """Auf max. size x size verkleinern (JPEG). Ohne Pillow unverändert zurückgeben."""
+    try:
+        from PIL import Image  # optional
+    except ImportError:
+        return content, ""
+    with Image.open(io.BytesIO(content)) as img:
+        if max(img.size) <= size:
+            return content, ""
+        img.thumbnail((size, size))
+        out = io.BytesIO()
+        img.convert("RGB").save(out, format="JPEG", quality=85)
+    return out.getvalue(), "image/jpeg"
+
+
+class ArtworkCache:
+    """Begrenzter LRU-Cache (Speicher + Platte) für Cover-URLs."""
+
+    MEMORY_ITEMS = 64
+    DISK_BYTES = 50 * 1024 * 1024
+    REVALIDATE_AFTER = 3600  # seconds
+    FETCH_TIMEOUT = 10  # seconds
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        cache_dir: str,
+        verify_ssl: bool,
+        thumbnail_size: int = 0,
+        add_executor_job=None,
+    ) -> None:
+        self._session = session
+        self._dir = cache_dir
+        self._verify_ssl = verify_ssl
+        self.thumbnail_size = thumbnail_size
+        # optional: (func, *args) -> Awaitable, z. B. hass.async_add_executor_job
+        self._add_executor_job = add_executor_job
+        self._memory: "OrderedDict[str, _Artwork]" = OrderedDict()
+        # je Schlüssel ein Lock plus Zahl der Aufrufer, die ihn halten oder darauf warten
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._lock_users: dict[str, int] = {}
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "not_modified": 0, "fetched": 0, "errors": 0}
+
+    @staticmethod
+    def _key(url: str, size: int = 0) -> str:
+        # Größe gehört zum Schlüssel: nach Änderung der Thumbnail-Größe nicht die alte Variante liefern
+        return hashlib.sha1(f"{size}:{url}".encode("utf-8")).hexdigest()
+
+    # ----- Platte (im Executor) -----
+    def _disk_read(self, key: str) -> Optional[_Artwork]:
+        path = os.path.join(self._dir, key)
+        try:
+            with open(path + ".json", encoding="utf-8") as fh:
+                meta = json.load(fh)
+            with open(path + ".bin", "rb") as fh:
+                content = fh.read()
+            os.utime(path + ".bin")  # LRU: Zugriffszeit = mtime
+        except (OSError, ValueError):
+            return None
+        art = _Artwork(content, meta.get("content_type") or "image/jpeg", meta.get("etag"), meta.get("last_modified"))
+        art.checked = float("-inf")  # unbekanntes Alter -> beim nächsten Zugriff revalidieren
+        return art
+
+    def _disk_write(self, key: str, art: _Artwork) -> None:
+        os.makedirs(self._dir, exist_ok=True)
+        path = os.path.join(self._dir, key)
+        with open(path + ".bin", "wb") as fh:
+            fh.write(art.content)
+        with open(path + ".json", "w", encoding="utf-8") as fh:
+            json.dump(art.meta(), fh)
+        self._disk_evict()
+
+    def _disk_evict(self) -> None:
+        files = []
+        total = 0
+        for name in os.listdir(self._dir):
+            if not name.endswith(".bin"):
+                continue
+            st = os.stat(os.path.join(self._dir, name))
+            files.append((st.st_mtime, st.st_size, name[:-4]))
+            total += st.st_size
+        for _mtime, size, key in sorted(files):
+            if total <= self.DISK_BYTES:
+                break
+            for ext in (".bin", ".json"):
+                try:
+                    os.remove(os.path.join(self._dir, key + ext))
+                except OSError:
+                    pass
+            total -= size
+
+    async def _run(self, func, *args):
+        if self._add_executor_job is not None:
+            return await self._add_executor_job(func, *args)
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    # ----- Speicher -----
+    def _remember(self, key: str, art: _Artwork) -> None:
+        self._memory[key] = art
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.MEMORY_ITEMS:
+            self._memory.popitem(last=False)
+
+    async def async_get(self, url: str) -> Tuple[Optional[bytes], Optional[str]]:
+        key = self._key(url, self.thumbnail_size)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                return await self._async_get(key, url)
+        finally:
+            # Lock erst verwerfen, wenn niemand mehr wartet (sonst zweiter Lock für denselben Schlüssel)
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._locks[key]
+
+    async def _async_get(self, key: str, url: str) -> Tuple[Optional[bytes], Optional[str]]:
+        art = self._memory.get(key)
+        if art is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+        else:
+            art = await self._run(self._disk_read, key)
+            if art is not None:
+                self.stats["disk_hits"] += 1
+                self._remember(key, art)
+        if art is not None and time.monotonic() - art.checked < self.REVALIDATE_AFTER:
+            return art.content, art.content_type
+
+        fetched = await self._async_fetch(url, art)
+        if fetched is None:
+            # Controller nicht erreichbar: vorhandene Kopie weiter ausliefern
+            return (art.content, art.content_type) if art is not None else (None, None)
+        if fetched is art:
+            return art.content, art.content_type
+        self._remember(key, fetched)
+        try:
+            await self._run(self._disk_write, key, fetched)
+        except OSError as exc:
+            _LOGGER.debug("artwork disk cache write failed: %s", exc)
+        return fetched.content, fetched.content_type
+
+    async def _async_fetch(self, url: str, cached: Optional[_Artwork]) -> Optional[_Artwork]:
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        try:
+            async with self._session.get(
+                url,
+                headers=headers,
+                ssl=self._verify_ssl,
+                timeout=aiohttp.ClientTimeout(total=self.FETCH_TIMEOUT),
+            ) as resp:
+                if resp.status == 304 and cached is not None:
+                    self.stats["not_modified"] += 1
+                    cached.checked = time.monotonic()
+                    return cached
+                resp.raise_for_status()
+                content = await resp.read()
+                content_type = resp.headers.get("Content-Type", "image/jpeg")
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            self.stats["errors"] += 1
+            _LOGGER.debug("artwork fetch failed for %s: %s", url, exc)
+            return None
+        self.stats["fetched"] += 1
+        if self.thumbnail_size:
+            try:
+                thumb, thumb_type = await self._run(_thumbnail, content, self.thumbnail_size)
+            except Exception as exc:  # noqa: BLE001
+                _LOGGER.debug("artwork thumbnail failed for %s: %s", url, exc)
+            else:
+                if thumb_type:
+                    content, content_type = thumb, thumb_type
+        return _Artwork(content, content_type, etag, last_modified)
@@ -0,0 +1,139 @@
+"""Media-Browser über die globale Quellenliste: Gruppen -> Seiten -> Quellen.
+
+Knoten werden erst beim Aufklappen gebaut und pro SourceIndex mit TTL gecacht, sodass
+Klicks durch hunderte Sender weder neu rechnen noch den Controller abfragen.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+import time
+from typing import Optional, Tuple
+
+from homeassistant.components.media_player import BrowseMedia, MediaClass, MediaType
+from homeassistant.components.media_player.errors import BrowseError
+
+from .sources import SourceIndex
+
+ROOT_ID = "root"
+PAGE_SIZE = 50
+
+# media_content_id-Formate
+_GROUP = "group:{group}"
+_PAGE = "group:{group}:page:{page}"
+_SOURCE = "source:{group}:{prog}"
+
+
+def parse_source_id(media_id: str) -> Optional[Tuple[int, int]]:
+    """'source:<group>:<prog>' -> (group, prog); sonst None."""
+    parts = media_id.split(":")
+    if len(parts) != 3 or parts[0] != "source":
+        return None
+    try:
+        return int(parts[1]), int(parts[2])
+    except ValueError:
+        return None
+
+
+class BrowseCache:
+    """LRU mit TTL für gebaute BrowseMedia-Knoten, Schlüssel (SourceIndex, content_id)."""
+
+    TTL = 300  # seconds
+    MAX_ITEMS = 256
+
+    def __init__(self) -> None:
+        self._items: "OrderedDict[tuple, tuple[float, BrowseMedia]]" = OrderedDict()
+
+    def get(self, index: SourceIndex, content_id: str) -> Optional[BrowseMedia]:
+        key = (index, content_id)
+        item = self._items.get(key)
+        if item is None:
+            return None
+        if time.monotonic() - item[0] > self.TTL:
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return item[1]
+
+    def put(self, index: SourceIndex, content_id: str, node: BrowseMedia) -> None:
+        self._items[(index, content_id)] = (time.monotonic(), node)
+        self._items.move_to_end((index, content_id))
+        while len(self._items) > self.MAX_ITEMS:
+            self._items.popitem(last=False)
+
+
+def _source_node(group: int, prog: int, name: str) -> BrowseMedia:
+    return BrowseMedia(
+        media_class=MediaClass.CHANNEL,
+        media_content_id=_SOURCE.format(group=group, prog=prog),
+        media_content_type=MediaType.CHANNEL,
+        title=name,
+        can_play=True,
+        can_expand=False,
+    )
+
+
+def _dir_node(content_id: str, title: str, children=None, children_class=MediaClass.CHANNEL) -> BrowseMedia:
+    return BrowseMedia(
+        media_class=MediaClass.DIRECTORY,
+        media_content_id=content_id,
+        media_content_type=MediaType.CHANNELS,
+        title=title,
+        can_play=False,
+        can_expand=True,
+        children=children,
+        children_media_class=children_class,
+    )
+
+
+def _group_children(index: SourceIndex, group: int) -> list[BrowseMedia]:
+    items = index.by_group.get(group)
+    if items is None:
+        raise BrowseError(f"Unknown source group {group}")
+    if len(items) <= PAGE_SIZE:
+        return [_source_node(group, prog, name) for prog, name in items]
+    pages = []
+    for page, start in enumerate(range(0, len(items), PAGE_SIZE)):
+        end = min(start + PAGE_SIZE, len(items))
+        pages.append(_dir_node(_PAGE.format(group=group, page=page), f"{start + 1}–{end}"))
+    return pages
+
+
+def _page_children(index: SourceIndex, group: int, page: int) -> list[BrowseMedia]:
+    items = index.by_group.get(group) or ()
+    chunk = items[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+    if not chunk:
+        raise BrowseError(f"Unknown page {page} in source group {group}")
+    return [_source_node(group, prog, name) for prog, name in chunk]
+
+
+def _build(index: SourceIndex, content_id: str) -> BrowseMedia:
+    if content_id == ROOT_ID:
+        groups = sorted(index.by_group)
+        if len(groups) == 1:
+            # nur eine Gruppe: direkt deren Inhalt zeigen
+            return _dir_node(ROOT_ID, "Sources", _group_children(index, groups[0]))
+        children = [_dir_node(_GROUP.format(group=g), f"Group {g}") for g in groups]
+        return _dir_node(ROOT_ID, "Sources", children, MediaClass.DIRECTORY)
+
+    parts = content_id.split(":")
+    try:
+        if len(parts) == 2 and parts[0] == "group":
+            group = int(parts[1])
+            return _dir_node(content_id, f"Group {group}", _group_children(index, group))
+        if len(parts) == 4 and parts[0] == "group" and parts[2] == "page":
+            group, page = int(parts[1]), int(parts[3])
+            children = _page_children(index, group, page)
+            start = page * PAGE_SIZE + 1
+            title = f"Group {group}: {start}–{start + len(children) - 1}"
+            return _dir_node(content_id, title, children)
+    except ValueError as exc:
+        raise BrowseError(f"Invalid media content id {content_id}") from exc
+    raise BrowseError(f"Unknown media content id {content_id}")
+
+
+def async_browse(index: SourceIndex, cache: BrowseCache, content_id: Optional[str]) -> BrowseMedia:
+    content_id = content_id or ROOT_ID
+    node = cache.get(index, content_id)
+    if node is None:
+        node = _build(index, content_id)
+        cache.put(index, content_id, node)
+    return node
@@ -0,0 +1,195 @@
+"""Geteilte HTTP-Ressourcen für mehrere Controller/Config-Einträge.
+
+- eine aiohttp-Session je Controller-Host (Keep-Alive, Verbindungslimit, DNS-Cache)
+- ein Token-Bucket je Host (Requests pro Sekunde)
+- ein gemeinsamer Poll-Takt, der die Einträge zeitlich versetzt refresht
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+# (coroutine, name) -> Task; in Home Assistant hass.async_create_background_task,
+# damit der Shutdown die Schleifen kennt und beendet
+TaskFactory = Callable[[Coroutine[Any, Any, Any], str], asyncio.Task]
+
+
+def _default_task_factory(coro: Coroutine[Any, Any, Any], name: str) -> asyncio.Task:
+    return asyncio.create_task(coro, name=name)
+
+
+def host_key(base_url: str) -> str:
+    parts = urlsplit(base_url if "://" in base_url else f"http://{base_url}")
+    return f"{parts.scheme}://{parts.netloc.lower()}"
+
+
+class HostRateLimiter:
+    """Token-Bucket: im Mittel `rate` Requests/s, kurzzeitig bis zu `burst`."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Token reservieren (Bestand darf negativ werden) und nur die eigene Wartezeit schlafen.
+
+        Kein Lock über dem Schlafen: die Reihenfolge ergibt sich aus der Reservierung.
+        """
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return
+        try:
+            await asyncio.sleep(-self._tokens / self.rate)
+        except asyncio.CancelledError:
+            # abgebrochene Reservierung zurückgeben
+            self._tokens += 1
+            raise
+
+
+class _HostPool:
+    __slots__ = ("session", "limiter", "users")
+
+    def __init__(self, session: aiohttp.ClientSession, limiter: HostRateLimiter) -> None:
+        self.session = session
+        self.limiter = limiter
+        self.users = 0
+
+
+class SharedPollScheduler:
+    """Ein Takt für alle Einträge; Einträge mit gleichem Intervall werden gleichmäßig versetzt."""
+
+    def __init__(self, create_task: TaskFactory = _default_task_factory) -> None:
+        # entry_id -> [refresh, interval, next_due, running task]
+        self._entries: Dict[str, list] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._create_task = create_task
+
+    def register(self, entry_id: str, refresh: Callable[[], Awaitable[None]], interval: float) -> None:
+        self._entries[entry_id] = [refresh, interval, 0.0, None]
+        self._spread()
+        if self._task is None or self._task.done():
+            self._task = self._create_task(self._run(), "veoovibes poll clock")
+
+    def set_interval(self, entry_id: str, interval: float) -> None:
+        if entry_id in self._entries:
+            self._entries[entry_id][1] = interval
+            self._spread()
+
+    def unregister(self, entry_id: str) -> None:
+        item = self._entries.pop(entry_id, None)
+        if item and item[3] is not None and not item[3].done():
+            item[3].cancel()
+        if self._entries:
+            self._spread()
+        elif self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def shutdown(self) -> None:
+        """Takt und laufende Refreshes aller Einträge beenden."""
+        entries, self._entries = self._entries, {}
+        for item in entries.values():
+            if item[3] is not None and not item[3].done():
+                item[3].cancel()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _spread(self) -> None:
+        """Phasen neu verteilen: Eintrag i startet bei i/n des Intervalls."""
+        now = time.monotonic()
+        n = len(self._entries)
+        for i, item in enumerate(self._entries.values()):
+            item[2] = now + item[1] * (i + 1) / n
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while self._entries:
+            now = time.monotonic()
+            for entry_id, item in list(self._entries.items()):
+                if item[2] > now:
+                    continue
+                item[2] = max(item[2] + item[1], now)
+                # Läuft der letzte Refresh noch, diesen Takt auslassen statt zu stapeln
+                if item[3] is None or item[3].done():
+                    item[3] = self._create_task(
+                        self._refresh(entry_id, item[0]), f"veoovibes refresh {entry_id}"
+                    )
+            next_due = min(item[2] for item in self._entries.values())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(0.0, next_due - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+
+    @staticmethod
+    async def _refresh(entry_id: str, refresh: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await refresh()
+        except Exception:  # noqa: BLE001
+            _LOGGER.exception("veoovibes: refresh for %s failed", entry_id)
+
+
+class ClientManager:
+    """Verwaltet Sessions/Rate-Limiter je Host und den gemeinsamen Poll-Takt (referenzgezählt)."""
+
+    CONNECTION_LIMIT = 8  # gleichzeitige Verbindungen je Host
+    KEEPALIVE_TIMEOUT = 30  # seconds
+    DNS_CACHE_TTL = 300  # seconds
+    HOST_RATE = 20.0  # Requests/s je Host
+    HOST_BURST = 10
+
+    def __init__(self, create_task: TaskFactory = _default_task_factory) -> None:
+        self._pools: Dict[str, _HostPool] = {}
+        self.create_task = create_task
+        self.scheduler = SharedPollScheduler(create_task)
+
+    def acquire(self, base_url: str) -> Tuple[aiohttp.ClientSession, HostRateLimiter]:
+        key = host_key(base_url)
+        pool = self._pools.get(key)
+        if pool is None or pool.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.CONNECTION_LIMIT,
+                limit_per_host=self.CONNECTION_LIMIT,
+                keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=self.DNS_CACHE_TTL,
+            )
+            pool = self._pools[key] = _HostPool(
+                aiohttp.ClientSession(connector=connector),
+                HostRateLimiter(self.HOST_RATE, self.HOST_BURST),
+            )
+        pool.users += 1
+        return pool.session, pool.limiter
+
+    async def release(self, base_url: str) -> None:
+        key = host_key(base_url)
+        pool = self._pools.get(key)
+        if pool is None:
+            return
+        pool.users -= 1
+        if pool.users <= 0:
+            self._pools.pop(key, None)
+            await pool.session.close()
+
+    @property
+    def idle(self) -> bool:
+        return not self._pools
+
+    async def async_close(self, *_args) -> None:
+        """Poll-Takt stoppen und alle Sessions schließen (z. B. beim Beenden von Home Assistant)."""
+        self.scheduler.shutdown()
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            await pool.session.close()
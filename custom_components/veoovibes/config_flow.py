@@ -1,6 +1,7 @@
 from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from .const import (
@@ -8,31 +9,51 @@ from .const import (
     CONF_BASE_URL,
     CONF_TOKEN,
     CONF_VERIFY_SSL,
+    CONF_ACTIVE_INTERVAL,
+    CONF_IDLE_INTERVAL,
+    CONF_IDLE_MAX_INTERVAL,
+    CONF_MAX_CONCURRENCY,
+    MAX_IN_FLIGHT,
+    CONF_ROOM_TIMEOUT,
     DEFAULT_VERIFY_SSL,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
 )
-from .api import VeoovibesClient, VeoovibesApiError
+from .api import VeoovibesApiError
+from .options_flow import OptionsFlowHandler
+from .probe import ProbeResult, async_probe_controller, probe_client
 
 class VeoovibesConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    def __init__(self) -> None:
+        self._data: dict = {}
+        self._probe: ProbeResult | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> OptionsFlowHandler:
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(self, user_input=None) -> FlowResult:
         errors = {}
         if user_input is not None:
-            session = async_get_clientsession(self.hass)
-            client = VeoovibesClient(
+            await self.async_set_unique_id(user_input[CONF_BASE_URL].rstrip("/"))
+            self._abort_if_unique_id_configured()
+            client = probe_client(
+                async_get_clientsession(self.hass),
                 user_input[CONF_BASE_URL],
                 user_input.get(CONF_TOKEN),
                 user_input.get(CONF_VERIFY_SSL, DEFAULT_VERIFY_SSL),
-                session,
             )
             try:
-                rooms = await client.list_rooms()
-                if not rooms:
+                probe = await async_probe_controller(client)
+                if not probe.rooms:
                     errors["base"] = "no_rooms"
                 else:
-                    await self.async_set_unique_id(user_input[CONF_BASE_URL].rstrip("/"))
-                    self._abort_if_unique_id_configured()
-                    return self.async_create_entry(title="Veoovibes", data=user_input)
+                    self._data = user_input
+                    self._probe = probe
+                    return await self.async_step_tuning()
             except VeoovibesApiError:
                 errors["base"] = "cannot_connect"
 
@@ -42,3 +63,35 @@ class VeoovibesConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Optional(CONF_VERIFY_SSL, default=DEFAULT_VERIFY_SSL): bool,
         })
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+
+    async def async_step_tuning(self, user_input=None) -> FlowResult:
+        """Messwerte anzeigen; empfohlene Polling-Werte sind vorausgefüllt."""
+        probe = self._probe
+        rec = probe.recommend()
+        errors = {}
+        if user_input is not None:
+            if probe.cycle_time(user_input[CONF_MAX_CONCURRENCY]) > user_input[CONF_IDLE_INTERVAL]:
+                errors["base"] = "interval_too_short"
+            elif user_input[CONF_ROOM_TIMEOUT] < DEFAULT_CONNECT_TIMEOUT + DEFAULT_READ_TIMEOUT:
+                errors[CONF_ROOM_TIMEOUT] = "room_timeout_too_short"
+            else:
+                options = {**rec, **user_input}
+                options[CONF_IDLE_MAX_INTERVAL] = max(options[CONF_IDLE_MAX_INTERVAL], options[CONF_IDLE_INTERVAL])
+                return self.async_create_entry(title="Veoovibes", data=self._data, options=options)
+
+        schema = vol.Schema({
+            vol.Required(CONF_ACTIVE_INTERVAL, default=rec[CONF_ACTIVE_INTERVAL]):
+                vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+            vol.Required(CONF_IDLE_INTERVAL, default=rec[CONF_IDLE_INTERVAL]):
+                vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+            vol.Required(CONF_MAX_CONCURRENCY, default=rec[CONF_MAX_CONCURRENCY]):
+                vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_IN_FLIGHT)),
+            vol.Required(CONF_ROOM_TIMEOUT, default=rec[CONF_ROOM_TIMEOUT]):
+                vol.All(vol.Coerce(int), vol.Range(min=1, max=180)),
+        })
+        return self.async_show_form(
+            step_id="tuning",
+            data_schema=schema,
+            errors=errors,
+            description_placeholders=probe.placeholders(),
+        )
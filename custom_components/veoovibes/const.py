@@ -4,11 +4,71 @@ CONF_BASE_URL = "base_url"
 CONF_TOKEN = "token"          # API key (query param: api_key)
 CONF_VERIFY_SSL = "verify_ssl"
 
-PLATFORMS = ["media_player"]
+PLATFORMS = ["media_player", "sensor"]
 
 DEFAULT_VERIFY_SSL = False
 DEFAULT_SCAN_INTERVAL = 10  # seconds
 
+# Adaptives Polling (Sekunden)
+CONF_ACTIVE_INTERVAL = "active_interval"
+CONF_IDLE_INTERVAL = "idle_interval"
+CONF_IDLE_MAX_INTERVAL = "idle_max_interval"
+DEFAULT_ACTIVE_INTERVAL = 2
+DEFAULT_IDLE_INTERVAL = DEFAULT_SCAN_INTERVAL
+DEFAULT_IDLE_MAX_INTERVAL = 120
+
 CONF_SOURCE_MAP = "source_map"
+SOURCE_FILE = "veoovibes_sources.yaml"  # Fallback in /config, wenn source_map leer ist
+SOURCE_FILE_CHECK_INTERVAL = 30  # seconds
 KEY_ROOMS = "rooms"
+# hass.data-Schlüssel für den geteilten ClientManager (nicht unter hass.data[DOMAIN], dort nur Einträge)
+DATA_CLIENT_MANAGER = f"{DOMAIN}_client_manager"
 KEY_STATE = "state"
+
+# Persistenter Snapshot (Topologie + letzter Status) für schnellen Start
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.snapshot"
+SNAPSHOT_SAVE_DELAY = 30  # seconds
+
+# Status-Abfrage: parallele room_player_status-Requests
+CONF_MAX_CONCURRENCY = "max_concurrency"
+CONF_ROOM_TIMEOUT = "room_timeout"
+DEFAULT_MAX_CONCURRENCY = 4
+# Obergrenze gleichzeitiger Requests je Client (In-Flight-Limit der Request-Queue); mehr
+# Parallelität in Optionen/Services wäre wirkungslos
+MAX_IN_FLIGHT = 8
+
+# HTTP-Timeouts je Request (Verbindungsaufbau / Lesen)
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_READ_TIMEOUT = "read_timeout"
+DEFAULT_CONNECT_TIMEOUT = 5  # seconds
+DEFAULT_READ_TIMEOUT = 10  # seconds
+# Timeout je Raum muss mindestens einen ganzen Versuch (Verbindung + Lesen) abdecken,
+# sonst greifen read_timeout und die Wiederholungen beim Polling nie
+DEFAULT_ROOM_TIMEOUT = DEFAULT_CONNECT_TIMEOUT + DEFAULT_READ_TIMEOUT  # seconds
+
+# Raum-Topologie (listrooms) nur selten neu laden
+CONF_TOPOLOGY_INTERVAL = "topology_interval"
+DEFAULT_TOPOLOGY_INTERVAL = 300  # seconds
+SERVICE_REFRESH_ROOMS = "refresh_rooms"
+
+# Sammelbefehle für mehrere Räume
+SERVICE_BULK_COMMAND = "bulk_command"
+BULK_COMMANDS = ["play", "stop", "volume", "source"]
+DEFAULT_BULK_CONCURRENCY = 8
+
+# Optimistische Zustände nach Befehlen (Sekunden bis zum Verfall)
+CONF_OPTIMISTIC_TIMEOUT = "optimistic_timeout"
+DEFAULT_OPTIMISTIC_TIMEOUT = 5
+
+# Cover-Proxy: optionale Thumbnail-Kantenlänge in Pixel (0 = Originalgröße)
+CONF_ARTWORK_THUMBNAIL_SIZE = "artwork_thumbnail_size"
+DEFAULT_ARTWORK_THUMBNAIL_SIZE = 0
+ARTWORK_CACHE_DIR = f"{DOMAIN}_artwork"  # unter /config/.cache (nicht in .storage: bläht Backups auf)
+
+# Dry-Run-Messung im Config-/Options-Flow (gedrosselt, nur lesende Endpunkte)
+CONF_APPLY_RECOMMENDED = "apply_recommended"
+PROBE_SAMPLE_ROOMS = 5
+PROBE_RATE = 4.0  # requests/s
+PROBE_BURST = 2
+PROBE_CYCLE_BUDGET = DEFAULT_IDLE_INTERVAL / 2  # seconds für einen vollen Status-Durchlauf
@@ -8,7 +8,15 @@ async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigE
     coord = data["coordinator"]
     return {
         "rooms": coord.data.get(KEY_ROOMS),
-        "state": coord.data.get(KEY_STATE),
+        "state": {rid: st.raw for rid, st in (coord.data.get(KEY_STATE) or {}).items()},
+        # unveränderte Controller-Felder (state/rooms enthalten nur die gelesenen)
+        "raw_payloads": data["client"].raw_diagnostics(),
+        "client_stats": dict(data["client"].command_stats),
+        "requests": data["client"].metrics.as_dict(),
+        "polling": data["poll_metrics"].as_dict(),
+        "controller_available": data["client"].available,
+        "request_queue": data["client"].queue.as_dict(),
+        "artwork_cache": dict(data["artwork"].stats),
         "config": {
             "base_url": entry.data.get("base_url", "***"),
             "verify_ssl": entry.data.get("verify_ssl", True),
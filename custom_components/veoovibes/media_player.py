@@ -1,16 +1,32 @@
 from __future__ import annotations
-from typing import Optional, List
+from typing import Any, Awaitable, Optional
 import logging
+import time
+from urllib.parse import urljoin
 from homeassistant.components.media_player import (
+    BrowseMedia,
     MediaPlayerEntity,
     MediaPlayerEntityFeature,
 )
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.components.media_player.const import MediaPlayerState, RepeatMode
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from .const import DOMAIN, KEY_ROOMS, KEY_STATE
+from homeassistant.util import dt as dt_util
+from .const import (
+    DOMAIN,
+    KEY_ROOMS,
+    KEY_STATE,
+    CONF_OPTIMISTIC_TIMEOUT,
+    DEFAULT_OPTIMISTIC_TIMEOUT,
+)
 from .api import VeoovibesClient, VeoovibesApiError
+from .request_queue import PRIORITY_COMMAND
+from .sources import SourceIndex, EMPTY_INDEX
+from .model import RoomStatus, EMPTY_STATUS
+from .browse_media import BrowseCache, async_browse, parse_source_id
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,6 +40,8 @@ FEATURES = (
     | MediaPlayerEntityFeature.PREVIOUS_TRACK
     | MediaPlayerEntityFeature.REPEAT_SET     # NEU
     | MediaPlayerEntityFeature.SELECT_SOURCE  # NEU
+    | MediaPlayerEntityFeature.BROWSE_MEDIA
+    | MediaPlayerEntityFeature.PLAY_MEDIA
     | MediaPlayerEntityFeature.VOLUME_SET
     | MediaPlayerEntityFeature.TURN_ON
     | MediaPlayerEntityFeature.TURN_OFF
@@ -38,16 +56,37 @@ async def async_setup_entry(hass, entry: ConfigEntry, async_add_entities):
         rid = room.get("id_room") or room.get("api_room_id") or room.get("key")
         return str(rid) if rid is not None else None
 
-    entities = []
-    seen = set()
-    for room in coordinator.data[KEY_ROOMS]:
-        rid = _rid(room)
-        if not rid or rid in seen:
-            continue
-        seen.add(rid)
-        name = room.get("name") or room.get("api_room_name") or f"Room {rid}"
-        entities.append(VeoRoomEntity(coordinator, client, entry, rid, name))
-    async_add_entities(entities, True)
+    seen: set[str] = set()
+    last_rooms: list = []
+
+    def _new_entities(rooms: list) -> list:
+        entities = []
+        for room in rooms:
+            rid = _rid(room)
+            if not rid or rid in seen:
+                continue
+            seen.add(rid)
+            name = room.get("name") or room.get("api_room_name") or f"Room {rid}"
+            entities.append(VeoRoomEntity(coordinator, client, entry, rid, name))
+        return entities
+
+    @callback
+    def _rooms_updated() -> None:
+        # Topologie-Cache liefert bei unveränderten Räumen dasselbe Listenobjekt
+        nonlocal last_rooms
+        rooms = coordinator.data[KEY_ROOMS]
+        if rooms is last_rooms:
+            return
+        last_rooms = rooms
+        entities = _new_entities(rooms)
+        if entities:
+            _LOGGER.debug("adding %d new room(s)", len(entities))
+            async_add_entities(entities)
+
+    last_rooms = coordinator.data[KEY_ROOMS]
+    # kein update_before_add: der erste Refresh läuft bereits (bzw. kommt aus dem Snapshot)
+    async_add_entities(_new_entities(last_rooms))
+    entry.async_on_unload(coordinator.async_add_listener(_rooms_updated))
 
 
 class VeoRoomEntity(CoordinatorEntity, MediaPlayerEntity):
@@ -70,68 +109,228 @@ class VeoRoomEntity(CoordinatorEntity, MediaPlayerEntity):
             manufacturer="inveoo",
             configuration_url=entry.data.get("base_url"),
         )
+        # Optimistische Werte (state/volume_level/repeat) bis zur Bestätigung durch den Controller
+        self._optimistic: dict[str, Any] = {}
+        self._optimistic_until = 0.0
+        # Zuletzt geschriebener Zustand, um unveränderte Räume beim Coordinator-Update zu überspringen
+        self._last_signature: Optional[tuple] = None
+        # Positions-Anker (position, updated_at, Titel-Identität); nur bei Titelwechsel/Drift neu gesetzt
+        self._position: Optional[float] = None
+        self._position_updated_at = None
+        self._position_track: Optional[tuple] = None
+
+    @property
+    def available(self) -> bool:
+        # Circuit Breaker offen -> sofort nicht verfügbar, auch zwischen zwei Refreshes
+        return super().available and self._client.available
 
     # ----- helpers -----
-    def _st(self) -> dict:
-        return self.coordinator.data[KEY_STATE].get(self._room_id, {}) or {}
+    def _st(self) -> RoomStatus:
+        return self.coordinator.data[KEY_STATE].get(self._room_id) or EMPTY_STATUS
+
+    async def _async_refresh_room(self) -> None:
+        """Nur diesen Raum neu abfragen (statt listrooms + alle Räume) und nur diese Entity aktualisieren."""
+        try:
+            status = RoomStatus.from_payload(
+                await self._client.get_room_status(self._room_id, PRIORITY_COMMAND)
+            )
+        except VeoovibesApiError as exc:
+            _LOGGER.debug("room refresh failed for room %s: %s", self._room_id, exc)
+            return
+        self.coordinator.data[KEY_STATE][self._room_id] = status
+        data = self.hass.data[DOMAIN][self._entry.entry_id]
+        data["scheduler"].record(self._room_id, status)
+        data["poll_metrics"].room_updated(self._room_id)
+        self._reconcile_optimistic()
+        self._sync_position()
+        self.async_write_ha_state()
+
+    # ----- optimistic state -----
+    def _opt(self) -> dict[str, Any]:
+        if self._optimistic and time.monotonic() >= self._optimistic_until:
+            self._optimistic = {}
+        return self._optimistic
+
+    def _set_optimistic(self, **values: Any) -> dict[str, Any]:
+        """Erwartetes Ergebnis sofort anzeigen; liefert den vorherigen Stand für Rollback."""
+        prev = dict(self._opt())
+        timeout = self._entry.options.get(CONF_OPTIMISTIC_TIMEOUT, DEFAULT_OPTIMISTIC_TIMEOUT)
+        self._optimistic = {**prev, **values}
+        self._optimistic_until = time.monotonic() + float(timeout)
+        self.async_write_ha_state()
+        return prev
+
+    def _reconcile_optimistic(self) -> None:
+        """Optimistische Werte verwerfen, sobald der echte Status sie bestätigt."""
+        opt = self._opt()
+        if not opt:
+            return
+        real = {
+            "state": self._real_state(),
+            "volume_level": self._real_volume_level(),
+            "repeat": self._real_repeat(),
+        }
+        self._optimistic = {
+            k: v for k, v in opt.items()
+            if not (v == real[k] or (k == "volume_level" and real[k] is not None and abs(v - real[k]) < 0.011))
+        }
+
+    async def _async_command(self, command: Awaitable, **optimistic: Any) -> Any:
+        """Befehl mit optimistischem Zustand senden; bei API-Fehler zurückrollen."""
+        prev = self._set_optimistic(**optimistic) if optimistic else None
+        # Raum nach einem Befehl eine Weile schnell pollen
+        self.hass.data[DOMAIN][self._entry.entry_id]["scheduler"].mark_active(self._room_id)
+        try:
+            return await command
+        except VeoovibesApiError:
+            if prev is not None:
+                self._optimistic = prev
+                self.async_write_ha_state()
+            raise
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._sync_position()
+
+    # Abweichung (s) zwischen gemeldeter und hochgerechneter Position, ab der neu synchronisiert wird
+    POSITION_DRIFT = 3.0
+
+    def _sync_position(self) -> None:
+        """Position nur bei Titelwechsel, Play/Stop-Wechsel oder Drift neu verankern.
+
+        Dazwischen rechnet das Frontend anhand von media_position_updated_at selbst weiter,
+        ohne dass ein State-Write nötig ist.
+        """
+        st = self._st()
+        if st.position is None:
+            self._position = self._position_updated_at = self._position_track = None
+            return
+        now = dt_util.utcnow()
+        track = (st.title, st.artist, st.album, st.duration, st.playing)
+        if self._position is not None and self._position_track == track:
+            expected = self._position
+            if st.playing:
+                expected += (now - self._position_updated_at).total_seconds()
+            if abs(expected - st.position) <= self.POSITION_DRIFT:
+                return
+        self._position = st.position
+        self._position_updated_at = now
+        self._position_track = track
+
+    @property
+    def media_position(self) -> Optional[float]:
+        return self._position
 
-    def _global_sources(self) -> list[dict]:
-        # Wird in __init__.py unter hass.data[DOMAIN][entry_id]["global_sources"] gepflegt
+    @property
+    def media_position_updated_at(self):
+        return self._position_updated_at
+
+    @property
+    def media_duration(self) -> Optional[float]:
+        return self._st().duration
+
+    def _state_signature(self) -> tuple:
+        """Alle Werte, die im HA-State landen; gleiche Signatur -> kein State-Write nötig."""
+        return (
+            self.available,
+            self.state,
+            self.volume_level,
+            self.repeat,
+            self.source,
+            self.source_list,
+            self.media_title,
+            self.media_artist,
+            self.media_album_name,
+            self.media_image_url,
+            self._st().stale,
+            self.media_duration,
+            self._position_updated_at,
+        )
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._last_signature = self._state_signature()
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._reconcile_optimistic()
+        self._sync_position()
+        if self._last_signature is not None and self._state_signature() == self._last_signature:
+            return
+        super()._handle_coordinator_update()
+
+    def _source_index(self) -> SourceIndex:
+        # Wird in __init__.py unter hass.data[DOMAIN][entry_id]["source_index"] gepflegt
         data = self.hass.data[DOMAIN][self._entry.entry_id]
-        return data.get("global_sources", []) or []
+        return data.get("source_index") or EMPTY_INDEX
 
     # ----- state mapping -----
     @property
     def state(self):
-        st = self._st()
-        playing = bool(st.get("is_playing", 0)) or str(st.get("status_code", "")).lower() == "playing"
-        if playing:
+        opt = self._opt()
+        if "state" in opt:
+            return opt["state"]
+        return self._real_state()
+
+    def _real_state(self):
+        if self._st().playing:
             return MediaPlayerState.PLAYING
         # Wunsch: bei "nicht spielend" als AUS anzeigen
         return MediaPlayerState.OFF
 
     @property
     def volume_level(self):
-        st = self._st()
-        vol = st.get("zone_volume")
-        if isinstance(vol, (int, float)):
-            return max(0.0, min(1.0, float(vol) / 100.0))
-        vol2 = st.get("current_volume")
-        if isinstance(vol2, (int, float)):
-            return max(0.0, min(1.0, float(vol2) / 100.0))
-        return None
+        opt = self._opt()
+        if "volume_level" in opt:
+            return opt["volume_level"]
+        return self._real_volume_level()
+
+    def _real_volume_level(self):
+        return self._st().volume
+
+    @property
+    def extra_state_attributes(self) -> Optional[dict[str, Any]]:
+        # Zustand stammt noch aus dem gespeicherten Snapshot (vor dem ersten echten Refresh)
+        return {"stale": True} if self._st().stale else None
 
     @property
     def media_title(self):
-        st = self._st()
-        return st.get("title") or st.get("radio_name")
+        return self._st().title
 
     @property
     def media_artist(self):
-        return self._st().get("artist")
+        return self._st().artist
 
     @property
     def media_album_name(self):
-        return self._st().get("album")
+        return self._st().album
 
     @property
     def media_image_url(self):
-        return self._st().get("cover")
+        cover = self._st().cover
+        if cover and "://" not in cover:
+            # relative Pfade auf den Controller beziehen
+            return urljoin(self._entry.data.get("base_url", "").rstrip("/") + "/", cover)
+        return cover
+
+    async def async_get_media_image(self) -> tuple[bytes | None, str | None]:
+        """Cover über den eigenen Cache (Speicher + Platte) statt direkt vom Controller."""
+        url = self.media_image_url
+        if not url:
+            return None, None
+        return await self.hass.data[DOMAIN][self._entry.entry_id]["artwork"].async_get(url)
 
     # ----- Repeat (Toggle) -----
     @property
     def repeat(self) -> Optional[str]:
-        st = self._st()
-        rep = st.get("repeat")
-        if isinstance(rep, (bool, int)):
-            return RepeatMode.ALL if bool(rep) else RepeatMode.OFF
-        if isinstance(rep, str):
-            rep_l = rep.lower()
-            if rep_l in ("all", "one", "true", "1"):
-                return RepeatMode.ALL
-            if rep_l in ("off", "false", "0"):
-                return RepeatMode.OFF
-        return RepeatMode.OFF
+        opt = self._opt()
+        if "repeat" in opt:
+            return opt["repeat"]
+        return self._real_repeat()
+
+    def _real_repeat(self) -> Optional[str]:
+        return RepeatMode.ALL if self._st().repeat else RepeatMode.OFF
 
     async def async_set_repeat(self, repeat: str) -> None:
         desired_on = repeat != RepeatMode.OFF
@@ -139,72 +338,106 @@ class VeoRoomEntity(CoordinatorEntity, MediaPlayerEntity):
         if desired_on != current_on:
             try:
                 # Toggle per API
-                await self._client.room_repeat(self._room_id)
+                await self._async_command(
+                    self._client.room_repeat(self._room_id),
+                    repeat=RepeatMode.ALL if desired_on else RepeatMode.OFF,
+                )
             except VeoovibesApiError as exc:
                 _LOGGER.debug("repeat toggle failed for room %s: %s", self._room_id, exc)
-        await self.coordinator.async_request_refresh()
+        await self._async_refresh_room()
 
     # ----- Source-Auswahl (global) -----
     @property
-    def source_list(self) -> Optional[List[str]]:
-        srcs = self._global_sources()
-        return [s["name"] for s in srcs] if srcs else None
+    def source_list(self) -> Optional[tuple[str, ...]]:
+        # geteiltes Tupel aus dem Index, kein Neuaufbau pro State-Write
+        names = self._source_index().names
+        return names if names else None
+
+    @property
+    def source(self) -> Optional[str]:
+        return self._source_index().source_for_status(self._st())
 
     async def async_select_source(self, source: str) -> None:
-        srcs = self._global_sources()
-        match = next((s for s in srcs if s.get("name") == source), None)
+        match = self._source_index().by_name.get(source)
         if not match:
             _LOGGER.warning("select_source: '%s' not in global sources", source)
             return
+        group, prog = match
         try:
-            await self._client.music_room(self._room_id, match["group"], match["prog"])
+            await self._async_command(
+                self._client.music_room(self._room_id, group, prog), state=MediaPlayerState.PLAYING
+            )
         except VeoovibesApiError as exc:
             _LOGGER.debug("select_source failed for room %s: %s", self._room_id, exc)
         finally:
-            await self.coordinator.async_request_refresh()
+            await self._async_refresh_room()
+
+    # ----- Media-Browser (Quellenliste) -----
+    async def async_browse_media(
+        self, media_content_type: Optional[str] = None, media_content_id: Optional[str] = None
+    ) -> BrowseMedia:
+        cache: BrowseCache = self.hass.data[DOMAIN][self._entry.entry_id]["browse_cache"]
+        return async_browse(self._source_index(), cache, media_content_id)
+
+    async def async_play_media(self, media_type: str, media_id: str, **kwargs: Any) -> None:
+        """'source:<group>:<prog>' aus dem Browser oder ein Quellenname aus der source_map."""
+        match = parse_source_id(media_id) or self._source_index().by_name.get(media_id)
+        if match is None:
+            raise HomeAssistantError(f"Unknown media id '{media_id}'")
+        group, prog = match
+        try:
+            await self._async_command(
+                self._client.music_room(self._room_id, group, prog), state=MediaPlayerState.PLAYING
+            )
+        finally:
+            await self._async_refresh_room()
 
     # ----- core media controls -----
     async def async_media_play(self):
-        await self._client.play_room(self._room_id)
-        await self.coordinator.async_request_refresh()
+        await self._async_command(self._client.play_room(self._room_id), state=MediaPlayerState.PLAYING)
+        await self._async_refresh_room()
 
     async def async_media_pause(self):
         """Treat pause as stop (für klare Play/Off UX)."""
-        await self._client.stop_room(self._room_id)
-        await self.coordinator.async_request_refresh()
+        await self._async_command(self._client.stop_room(self._room_id), state=MediaPlayerState.OFF)
+        await self._async_refresh_room()
 
     async def async_media_stop(self):
-        await self._client.stop_room(self._room_id)
-        await self.coordinator.async_request_refresh()
+        await self._async_command(self._client.stop_room(self._room_id), state=MediaPlayerState.OFF)
+        await self._async_refresh_room()
 
     async def async_media_next_track(self):
-        await self._client.next_room(self._room_id)
-        await self.coordinator.async_request_refresh()
+        await self._async_command(self._client.next_room(self._room_id))
+        await self._async_refresh_room()
 
     async def async_media_previous_track(self):
-        await self._client.prev_room(self._room_id)
-        await self.coordinator.async_request_refresh()
+        await self._async_command(self._client.prev_room(self._room_id))
+        await self._async_refresh_room()
 
     async def async_set_volume_level(self, volume: float):
         vol_0_100 = int(max(0.0, min(1.0, volume)) * 100.0)
-        await self._client.set_room_volume(self._room_id, vol_0_100)
-        await self.coordinator.async_request_refresh()
+        sent = await self._async_command(
+            self._client.set_room_volume(self._room_id, vol_0_100), volume_level=vol_0_100 / 100.0
+        )
+        # Überholte (zusammengefasste) Slider-Werte lösen keinen eigenen Refresh aus
+        if sent:
+            await self._async_refresh_room()
 
     # ----- Power toggle for tiles (Play ↔ Off), robust gegen API-Fehler -----
     async def async_turn_on(self):
         """Map 'turn_on' to Play; Fehler werden geloggt, nicht geworfen."""
         try:
-            await self._client.play_room(self._room_id)
+            await self._async_command(self._client.play_room(self._room_id), state=MediaPlayerState.PLAYING)
         except VeoovibesApiError as exc:
             _LOGGER.debug("turn_on failed for room %s: %s", self._room_id, exc)
         finally:
-            await self.coordinator.async_request_refresh()
+            await self._async_refresh_room()
 
     async def async_turn_off(self):
         """Map 'turn_off' to Stop."""
         try:
-            await self._client.stop_room(self._room_id)
+            await self._async_command(self._client.stop_room(self._room_id), state=MediaPlayerState.OFF)
         except VeoovibesApiError as exc:
             _LOGGER.debug("turn_off failed for room %s: %s", self._room_id, exc)
         finally:
-            await self.coordinator.async_request_refresh()
+            await self._async_refresh_room()
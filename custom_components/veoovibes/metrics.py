@@ -0,0 +1,107 @@
+"""Laufzeit-Metriken für Client und Coordinator (für Diagnostics und Diagnose-Sensoren)."""
+from __future__ import annotations
+from collections import deque
+import math
+import time
+from typing import Deque, Dict, Iterable, Optional
+
+# Obergrenzen der Histogramm-Buckets in Sekunden (letzter Bucket: alles darüber)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _percentile(sorted_values: list, pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    # nearest-rank
+    idx = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+class LatencyStats:
+    """Zähler, Fehler, Bytes, Histogramm und die letzten Messwerte für Perzentile."""
+
+    __slots__ = ("count", "errors", "bytes", "buckets", "_samples")
+
+    SAMPLE_SIZE = 500
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._samples: Deque[float] = deque(maxlen=self.SAMPLE_SIZE)
+
+    def record(self, seconds: float, ok: bool = True, size: int = 0) -> None:
+        self.count += 1
+        if not ok:
+            self.errors += 1
+        self.bytes += size
+        self._samples.append(seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def percentiles(self, pcts: Iterable[float] = (50, 95, 99)) -> Dict[str, Optional[float]]:
+        values = sorted(self._samples)
+        return {f"p{int(p)}": _percentile(values, p) for p in pcts}
+
+    def as_dict(self) -> dict:
+        labels = [f"<={b}s" for b in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            **self.percentiles(),
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+class RequestMetrics:
+    """Pro Endpunkt (cmd) eine LatencyStats."""
+
+    def __init__(self) -> None:
+        self.endpoints: Dict[str, LatencyStats] = {}
+
+    def record(self, cmd: str, seconds: float, ok: bool = True, size: int = 0) -> None:
+        stats = self.endpoints.get(cmd)
+        if stats is None:
+            stats = self.endpoints[cmd] = LatencyStats()
+        stats.record(seconds, ok, size)
+
+    def as_dict(self) -> dict:
+        return {cmd: stats.as_dict() for cmd, stats in sorted(self.endpoints.items())}
+
+
+class PollMetrics:
+    """Dauer der Coordinator-Zyklen und Alter des letzten Status je Raum."""
+
+    def __init__(self) -> None:
+        self.cycles = LatencyStats()
+        self.last_cycle: Optional[float] = None
+        self._room_updated: Dict[str, float] = {}
+
+    def record_cycle(self, seconds: float, ok: bool = True) -> None:
+        self.last_cycle = seconds
+        self.cycles.record(seconds, ok)
+
+    def room_updated(self, room_id: str, now: Optional[float] = None) -> None:
+        self._room_updated[room_id] = time.monotonic() if now is None else now
+
+    def staleness(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Sekunden seit dem letzten erfolgreichen Status je Raum."""
+        now = time.monotonic() if now is None else now
+        return {rid: round(now - ts, 3) for rid, ts in self._room_updated.items()}
+
+    def max_staleness(self) -> Optional[float]:
+        stale = self.staleness()
+        return max(stale.values()) if stale else None
+
+    def as_dict(self) -> dict:
+        return {
+            "last_cycle": self.last_cycle,
+            "cycles": self.cycles.as_dict(),
+            "room_staleness": self.staleness(),
+        }
@@ -0,0 +1,126 @@
+"""Normalisierter Raum-Status: room_player_status wird einmal pro Refresh geparst."""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Optional, Tuple
+
+# Mögliche Schlüsselpaare für die aktuelle Quelle in room_player_status
+_SOURCE_KEYS = (("group", "prog"), ("music_group", "music_prog"), ("id_group", "id_prog"))
+# Mögliche Felder für Spielposition/Titellänge (Sekunden oder "mm:ss"/"hh:mm:ss")
+_POSITION_KEYS = ("position", "elapsed", "time_elapsed", "current_time", "elapsed_time")
+_DURATION_KEYS = ("duration", "length", "time_total", "total_time", "track_length")
+
+# Nur diese Felder werden aus den API-Antworten übernommen (Rest wird beim Dekodieren verworfen)
+STATUS_FIELDS = frozenset(
+    ("is_playing", "status_code", "zone_volume", "current_volume", "repeat",
+     "title", "artist", "album", "cover", "radio_name")
+    + tuple(k for pair in _SOURCE_KEYS for k in pair)
+    + _POSITION_KEYS
+    + _DURATION_KEYS
+)
+ROOM_FIELDS = ("id_room", "api_room_id", "name", "api_room_name")
+# Für den gespeicherten Snapshot: ohne Position/Dauer, die sich bei jedem Poll ändern
+SNAPSHOT_FIELDS = STATUS_FIELDS - frozenset(_POSITION_KEYS) - frozenset(_DURATION_KEYS)
+
+
+def _volume(payload: dict) -> Optional[float]:
+    for key in ("zone_volume", "current_volume"):
+        vol = payload.get(key)
+        if isinstance(vol, (int, float)):
+            return max(0.0, min(1.0, float(vol) / 100.0))
+    return None
+
+
+def _repeat(payload: dict) -> bool:
+    rep = payload.get("repeat")
+    if isinstance(rep, (bool, int)):
+        return bool(rep)
+    if isinstance(rep, str):
+        return rep.lower() in ("all", "one", "true", "1")
+    return False
+
+
+def _seconds(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value >= 0 else None
+    if isinstance(value, str) and value.strip():
+        try:
+            total = 0.0
+            for part in value.strip().split(":"):
+                total = total * 60 + float(part)
+        except ValueError:
+            return None
+        return total if total >= 0 else None
+    return None
+
+
+def _first_seconds(payload: dict, keys: Tuple[str, ...]) -> Optional[float]:
+    for key in keys:
+        value = _seconds(payload.get(key))
+        if value is not None:
+            return value
+    return None
+
+
+def _source_key(payload: dict) -> Optional[Tuple[int, int]]:
+    for gkey, pkey in _SOURCE_KEYS:
+        group, prog = payload.get(gkey), payload.get(pkey)
+        if group is None or prog is None:
+            continue
+        try:
+            return int(group), int(prog)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class RoomStatus:
+    """Vorausgewertete Felder eines room_player_status; `raw` bleibt für Diagnostics erhalten."""
+
+    playing: bool = False
+    volume: Optional[float] = None
+    repeat: bool = False
+    title: Optional[str] = None
+    artist: Optional[str] = None
+    album: Optional[str] = None
+    cover: Optional[str] = None
+    radio_name: Optional[str] = None
+    source_key: Optional[Tuple[int, int]] = None
+    position: Optional[float] = None
+    duration: Optional[float] = None
+    # aus dem gespeicherten Snapshot beim Start, noch nicht vom Controller bestätigt
+    stale: bool = False
+    raw: dict = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_payload(cls, payload: Any, stale: bool = False) -> "RoomStatus":
+        if not isinstance(payload, dict):
+            return EMPTY_STATUS
+        playing = bool(payload.get("is_playing", 0)) or str(payload.get("status_code", "")).lower() == "playing"
+        return cls(
+            playing=playing,
+            volume=_volume(payload),
+            repeat=_repeat(payload),
+            title=payload.get("title") or payload.get("radio_name"),
+            artist=payload.get("artist"),
+            album=payload.get("album"),
+            cover=payload.get("cover"),
+            radio_name=payload.get("radio_name"),
+            source_key=_source_key(payload),
+            position=_first_seconds(payload, _POSITION_KEYS),
+            duration=_first_seconds(payload, _DURATION_KEYS) or None,
+            stale=stale,
+            raw=payload,
+        )
+
+    def snapshot_key(self) -> tuple:
+        """Vergleichswert für den Snapshot (ohne Position/Dauer/stale)."""
+        return (
+            self.playing, self.volume, self.repeat, self.title, self.artist,
+            self.album, self.cover, self.radio_name, self.source_key,
+        )
+
+
+EMPTY_STATUS = RoomStatus()
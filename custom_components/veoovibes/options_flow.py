@@ -2,7 +2,37 @@ from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
-from .const import CONF_SOURCE_MAP
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from .const import (
+    CONF_BASE_URL,
+    CONF_TOKEN,
+    CONF_VERIFY_SSL,
+    DEFAULT_VERIFY_SSL,
+    CONF_APPLY_RECOMMENDED,
+    CONF_SOURCE_MAP,
+    CONF_ACTIVE_INTERVAL,
+    CONF_IDLE_INTERVAL,
+    CONF_IDLE_MAX_INTERVAL,
+    CONF_MAX_CONCURRENCY,
+    MAX_IN_FLIGHT,
+    CONF_ROOM_TIMEOUT,
+    CONF_TOPOLOGY_INTERVAL,
+    CONF_CONNECT_TIMEOUT,
+    CONF_READ_TIMEOUT,
+    CONF_ARTWORK_THUMBNAIL_SIZE,
+    DEFAULT_ACTIVE_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    DEFAULT_IDLE_MAX_INTERVAL,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_ROOM_TIMEOUT,
+    DEFAULT_TOPOLOGY_INTERVAL,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_ARTWORK_THUMBNAIL_SIZE,
+)
+from .api import VeoovibesApiError
+from .probe import ProbeResult, async_probe_controller, empty_placeholders, probe_client
+from .sources import parse_source_map
 
 EXAMPLE = (
     "sources:\n"
@@ -15,20 +45,110 @@ EXAMPLE = (
 )
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
-    """Options-Dialog für globale Quellenliste."""
+    """Options-Dialog: Dry-Run-Messung, Polling-Intervalle, danach globale Quellenliste."""
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         self.config_entry = config_entry
+        self._options: dict = {}
+        self._probe: ProbeResult | None = None
 
     async def async_step_init(self, user_input=None):
-        return await self.async_step_sources(user_input)
+        conf = self.config_entry.data
+        client = probe_client(
+            async_get_clientsession(self.hass),
+            conf[CONF_BASE_URL],
+            conf.get(CONF_TOKEN),
+            conf.get(CONF_VERIFY_SSL, DEFAULT_VERIFY_SSL),
+        )
+        try:
+            self._probe = await async_probe_controller(client)
+        except VeoovibesApiError:
+            # Controller nicht erreichbar: Optionen bleiben trotzdem bearbeitbar
+            self._probe = None
+        return await self.async_step_polling()
 
-    async def async_step_sources(self, user_input=None):
+    async def async_step_polling(self, user_input=None):
+        errors = {}
+        probe = self._probe
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            user_input = dict(user_input)
+            attempt = user_input[CONF_CONNECT_TIMEOUT] + user_input[CONF_READ_TIMEOUT]
+            if user_input.pop(CONF_APPLY_RECOMMENDED, False) and probe is not None:
+                user_input.update(probe.recommend())
+                user_input[CONF_ROOM_TIMEOUT] = max(user_input[CONF_ROOM_TIMEOUT], attempt)
+            if user_input[CONF_IDLE_MAX_INTERVAL] < user_input[CONF_IDLE_INTERVAL]:
+                errors["base"] = "idle_max_too_small"
+            elif user_input[CONF_ROOM_TIMEOUT] < attempt:
+                errors[CONF_ROOM_TIMEOUT] = "room_timeout_too_short"
+            elif probe is not None and probe.cycle_time(user_input[CONF_MAX_CONCURRENCY]) > user_input[CONF_IDLE_INTERVAL]:
+                errors["base"] = "interval_too_short"
+            else:
+                self._options.update(user_input)
+                return await self.async_step_sources()
+
+        opts = self.config_entry.options
+        schema = vol.Schema({
+            vol.Required(
+                CONF_ACTIVE_INTERVAL, default=opts.get(CONF_ACTIVE_INTERVAL, DEFAULT_ACTIVE_INTERVAL)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+            vol.Required(
+                CONF_IDLE_INTERVAL, default=opts.get(CONF_IDLE_INTERVAL, DEFAULT_IDLE_INTERVAL)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+            vol.Required(
+                CONF_IDLE_MAX_INTERVAL, default=opts.get(CONF_IDLE_MAX_INTERVAL, DEFAULT_IDLE_MAX_INTERVAL)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+            vol.Required(
+                CONF_MAX_CONCURRENCY,
+                default=min(opts.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY), MAX_IN_FLIGHT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_IN_FLIGHT)),
+            vol.Required(
+                CONF_ROOM_TIMEOUT,
+                default=max(
+                    opts.get(CONF_ROOM_TIMEOUT, DEFAULT_ROOM_TIMEOUT),
+                    opts.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)
+                    + opts.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=180)),
+            vol.Required(
+                CONF_TOPOLOGY_INTERVAL, default=opts.get(CONF_TOPOLOGY_INTERVAL, DEFAULT_TOPOLOGY_INTERVAL)
+            ): vol.All(vol.Coerce(int), vol.Range(min=30, max=86400)),
+            vol.Required(
+                CONF_CONNECT_TIMEOUT, default=opts.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+            vol.Required(
+                CONF_READ_TIMEOUT, default=opts.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+            vol.Required(
+                CONF_ARTWORK_THUMBNAIL_SIZE,
+                default=opts.get(CONF_ARTWORK_THUMBNAIL_SIZE, DEFAULT_ARTWORK_THUMBNAIL_SIZE),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=2048)),
+            vol.Optional(CONF_APPLY_RECOMMENDED, default=False): bool,
+        })
+        return self.async_show_form(
+            step_id="polling",
+            data_schema=schema,
+            errors=errors,
+            description_placeholders=probe.placeholders() if probe is not None else empty_placeholders(),
+        )
 
+    async def async_step_sources(self, user_input=None):
+        errors = {}
+        problems: list[str] = []
         current = self.config_entry.options.get(CONF_SOURCE_MAP, EXAMPLE)
+        if user_input is not None:
+            _, problems = parse_source_map(user_input.get(CONF_SOURCE_MAP, ""))
+            if problems:
+                errors[CONF_SOURCE_MAP] = "invalid_source_map"
+                current = user_input.get(CONF_SOURCE_MAP, "")
+            else:
+                return self.async_create_entry(title="", data={**self.config_entry.options, **self._options, **user_input})
+
         schema = vol.Schema({vol.Optional(CONF_SOURCE_MAP, default=current): str})
-        return self.async_show_form(step_id="sources", data_schema=schema)
+        return self.async_show_form(
+            step_id="sources",
+            data_schema=schema,
+            errors=errors,
+            description_placeholders={"problems": "; ".join(problems[:5])},
+        )
 
 @callback
 def async_get_options_flow(config_entry):
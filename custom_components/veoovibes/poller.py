@@ -0,0 +1,77 @@
+"""Ein Poll-Zyklus (Topologie + fällige Raum-Status), unabhängig von Home Assistant."""
+from __future__ import annotations
+import dataclasses
+import time
+from typing import Optional
+
+from .api import VeoovibesClient, VeoovibesUnavailableError
+from .const import KEY_ROOMS, KEY_STATE, DEFAULT_MAX_CONCURRENCY, DEFAULT_ROOM_TIMEOUT
+from .metrics import PollMetrics
+from .model import RoomStatus
+from .scheduler import AdaptivePollScheduler
+from .topology import RoomTopologyCache
+
+
+class RoomPoller:
+    """Liefert die Coordinator-Daten {KEY_ROOMS, KEY_STATE} für einen Zyklus."""
+
+    def __init__(
+        self,
+        client: VeoovibesClient,
+        topology: RoomTopologyCache,
+        scheduler: AdaptivePollScheduler,
+        metrics: PollMetrics,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        room_timeout: float = DEFAULT_ROOM_TIMEOUT,
+    ) -> None:
+        self.client = client
+        self.topology = topology
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self.max_concurrency = max_concurrency
+        self.room_timeout = room_timeout
+
+    async def async_poll(self, prev_data: Optional[dict]) -> dict:
+        """Einen Zyklus ausführen; VeoovibesApiError bei Fehlern (Dauer wird immer erfasst)."""
+        start = time.monotonic()
+        ok = False
+        try:
+            result = await self._async_fetch(prev_data)
+            ok = True
+            return result
+        finally:
+            self.metrics.record_cycle(time.monotonic() - start, ok)
+
+    async def _async_fetch(self, prev_data: Optional[dict]) -> dict:
+        # listrooms nur alle topology_interval Sekunden; unverändert -> gleiches Listenobjekt
+        rooms = await self.topology.async_get_rooms()
+        room_ids = []
+        for r in rooms:
+            rid = r.get("id_room") or r.get("api_room_id") or r.get("key")
+            if rid is not None:
+                room_ids.append(str(rid))
+        self.scheduler.forget(room_ids)
+        # Nur fällige Räume abfragen (aktive oft, inaktive mit Backoff); übrige behalten letzten Status
+        due = self.scheduler.due_rooms(room_ids)
+        # Status fälliger Räume parallel abfragen (begrenzt), Zykluszeit ~ langsamster Raum
+        payloads = await self.client.get_room_statuses(
+            due, max_concurrency=self.max_concurrency, room_timeout=self.room_timeout
+        )
+        # einmal pro Refresh normalisieren; Entities lesen nur noch Felder
+        fresh = {rid: RoomStatus.from_payload(p) for rid, p in payloads.items()}
+        if not self.client.available:
+            # Circuit Breaker offen: Entities als nicht verfügbar markieren, Probe läuft im Hintergrund
+            raise VeoovibesUnavailableError("controller unavailable")
+        for rid in due:
+            self.scheduler.record(rid, fresh.get(rid))
+        for rid in fresh:
+            self.metrics.room_updated(rid)
+        prev = prev_data[KEY_STATE] if prev_data else {}
+        state_by_room = {rid: prev[rid] for rid in room_ids if rid in prev}
+        state_by_room.update(fresh)
+        # fällige, aber fehlgeschlagene Räume (Timeout/5xx) als veraltet markieren
+        for rid in due:
+            st = state_by_room.get(rid)
+            if rid not in fresh and st is not None and not st.stale:
+                state_by_room[rid] = dataclasses.replace(st, stale=True)
+        return {KEY_ROOMS: rooms, KEY_STATE: state_by_room}
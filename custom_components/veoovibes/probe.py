@@ -0,0 +1,138 @@
+"""Dry-Run-Messung für Config-/Options-Flow: Controller-Latenz messen und Polling-Werte empfehlen."""
+from __future__ import annotations
+from dataclasses import dataclass
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+
+from .api import VeoovibesApiError, VeoovibesClient
+from .client_manager import HostRateLimiter
+from .const import (
+    CONF_ACTIVE_INTERVAL,
+    CONF_IDLE_INTERVAL,
+    CONF_IDLE_MAX_INTERVAL,
+    CONF_MAX_CONCURRENCY,
+    CONF_ROOM_TIMEOUT,
+    DEFAULT_ACTIVE_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    DEFAULT_IDLE_MAX_INTERVAL,
+    DEFAULT_ROOM_TIMEOUT,
+    MAX_IN_FLIGHT,
+    PROBE_BURST,
+    PROBE_CYCLE_BUDGET,
+    PROBE_RATE,
+    PROBE_SAMPLE_ROOMS,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ProbeResult:
+    """Messwerte eines Dry-Runs (Sekunden)."""
+
+    rooms: int
+    listrooms: float
+    status: Tuple[float, ...] = ()
+    errors: int = 0
+
+    @property
+    def status_max(self) -> float:
+        """Langsamste Status-Abfrage (ersatzweise listrooms, falls keine gelang)."""
+        return max(self.status) if self.status else self.listrooms
+
+    @property
+    def status_median(self) -> float:
+        if not self.status:
+            return self.listrooms
+        ordered = sorted(self.status)
+        return ordered[(len(ordered) - 1) // 2]
+
+    def cycle_time(self, concurrency: int) -> float:
+        """Geschätzte Dauer eines Status-Durchlaufs über alle Räume (mehr als MAX_IN_FLIGHT läuft nie parallel)."""
+        return math.ceil(self.rooms / max(1, min(concurrency, MAX_IN_FLIGHT))) * self.status_max
+
+    def recommend(self) -> Dict[str, int]:
+        """Polling-Optionen, die zur gemessenen Geschwindigkeit passen (nie schneller als die Defaults)."""
+        lat = self.status_max
+        concurrency = min(
+            MAX_IN_FLIGHT,
+            max(1, math.ceil(self.rooms * lat / PROBE_CYCLE_BUDGET)),
+        )
+        idle = min(600, max(DEFAULT_IDLE_INTERVAL, math.ceil(2 * self.cycle_time(concurrency))))
+        return {
+            CONF_ACTIVE_INTERVAL: min(60, max(DEFAULT_ACTIVE_INTERVAL, math.ceil(4 * lat))),
+            CONF_IDLE_INTERVAL: idle,
+            CONF_IDLE_MAX_INTERVAL: max(DEFAULT_IDLE_MAX_INTERVAL, idle),
+            CONF_MAX_CONCURRENCY: concurrency,
+            CONF_ROOM_TIMEOUT: min(180, max(DEFAULT_ROOM_TIMEOUT, math.ceil(4 * lat))),
+        }
+
+    def placeholders(self) -> Dict[str, str]:
+        rec = self.recommend()
+        return {
+            "rooms": str(self.rooms),
+            "listrooms_ms": f"{self.listrooms * 1000:.0f}",
+            "status_ms": f"{self.status_median * 1000:.0f}",
+            "status_max_ms": f"{self.status_max * 1000:.0f}",
+            "errors": str(self.errors),
+            "rec_active": str(rec[CONF_ACTIVE_INTERVAL]),
+            "rec_idle": str(rec[CONF_IDLE_INTERVAL]),
+            "rec_concurrency": str(rec[CONF_MAX_CONCURRENCY]),
+            "rec_timeout": str(rec[CONF_ROOM_TIMEOUT]),
+        }
+
+
+def empty_placeholders() -> Dict[str, str]:
+    """Platzhalter, wenn keine Messung möglich war."""
+    return {
+        key: "–"
+        for key in (
+            "rooms", "listrooms_ms", "status_ms", "status_max_ms", "errors",
+            "rec_active", "rec_idle", "rec_concurrency", "rec_timeout",
+        )
+    }
+
+
+def probe_client(
+    session: aiohttp.ClientSession, base_url: str, api_key: Optional[str], verify_ssl: bool
+) -> VeoovibesClient:
+    """Eigener Client ohne Wiederholungen (verfälschen sonst die Latenz)."""
+    return VeoovibesClient(base_url, api_key, verify_ssl, session, read_retries=0, max_in_flight=1)
+
+
+async def async_probe_controller(
+    client: VeoovibesClient, sample_rooms: int = PROBE_SAMPLE_ROOMS
+) -> ProbeResult:
+    """listrooms und eine Stichprobe room_player_status nacheinander messen (nur lesend).
+
+    Gedrosselt auf PROBE_RATE; die Wartezeit im Limiter zählt nicht zur Latenz.
+    Wirft VeoovibesApiError, wenn schon listrooms scheitert.
+    """
+    limiter = HostRateLimiter(PROBE_RATE, PROBE_BURST)
+    try:
+        await limiter.acquire()
+        start = time.perf_counter()
+        rooms = await client.list_rooms()
+        listrooms = time.perf_counter() - start
+
+        ids = [r.get("id_room") or r.get("api_room_id") or r.get("key") for r in rooms]
+        ids = [rid for rid in ids if rid is not None]
+        # gleichmäßig über die Raumliste verteilt
+        step = max(1, len(ids) // max(1, sample_rooms))
+        sample = ids[::step][:sample_rooms]
+
+        latencies: list[float] = []
+        errors = 0
+        for rid in sample:
+            await limiter.acquire()
+            start = time.perf_counter()
+            try:
+                await client.get_room_status(rid)
+            except VeoovibesApiError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+    finally:
+        client.close()
+    return ProbeResult(len(rooms), listrooms, tuple(latencies), errors)
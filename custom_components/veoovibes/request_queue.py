@@ -0,0 +1,88 @@
+"""Request-Scheduler für den Client: Priorität für Befehle, FIFO je Raum, globales In-Flight-Limit."""
+from __future__ import annotations
+import asyncio
+from contextlib import asynccontextmanager
+import heapq
+import itertools
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+from .metrics import LatencyStats
+
+PRIORITY_COMMAND = 0  # Benutzerbefehle (und der Refresh direkt danach)
+PRIORITY_POLL = 1  # Hintergrund-Polling
+
+_PRIORITY_NAMES = {PRIORITY_COMMAND: "command", PRIORITY_POLL: "poll"}
+
+
+class RequestScheduler:
+    """Vergibt höchstens `max_in_flight` gleichzeitige Slots; Wartende nach Priorität, dann FIFO.
+
+    Befehle für denselben Raum laufen strikt nacheinander in Aufrufreihenfolge.
+    """
+
+    def __init__(self, max_in_flight: int) -> None:
+        self.max_in_flight = max(1, int(max_in_flight))
+        self._in_flight = 0
+        self._waiters: List[tuple] = []  # Heap: (priority, seq, future)
+        self._seq = itertools.count()
+        self._room_locks: Dict[str, asyncio.Lock] = {}
+        self.wait_stats: Dict[int, LatencyStats] = {p: LatencyStats() for p in _PRIORITY_NAMES}
+        self.max_depth: Dict[int, int] = {p: 0 for p in _PRIORITY_NAMES}
+
+    def depth(self, priority: Optional[int] = None) -> int:
+        """Anzahl wartender Requests (optional nur einer Priorität)."""
+        return sum(
+            1 for prio, _seq, fut in self._waiters
+            if not fut.done() and (priority is None or prio == priority)
+        )
+
+    async def _acquire(self, priority: int) -> None:
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        self.max_depth[priority] = max(self.max_depth[priority], self.depth(priority))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Slot wurde schon übergeben: weiterreichen
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        while self._waiters:
+            _prio, _seq, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)  # Slot direkt übergeben, In-Flight bleibt gleich
+                return
+        self._in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int, room: Optional[str] = None) -> AsyncIterator[None]:
+        start = time.monotonic()
+        lock = None
+        if room is not None and priority == PRIORITY_COMMAND:
+            lock = self._room_locks.setdefault(room, asyncio.Lock())
+            await lock.acquire()
+        try:
+            await self._acquire(priority)
+            self.wait_stats[priority].record(time.monotonic() - start)
+            try:
+                yield
+            finally:
+                self._release()
+        finally:
+            if lock is not None:
+                lock.release()
+
+    def as_dict(self) -> dict:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "queue_depth": {name: self.depth(p) for p, name in _PRIORITY_NAMES.items()},
+            "max_queue_depth": {name: self.max_depth[p] for p, name in _PRIORITY_NAMES.items()},
+            "wait_time": {name: self.wait_stats[p].as_dict() for p, name in _PRIORITY_NAMES.items()},
+        }
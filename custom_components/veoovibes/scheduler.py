@@ -0,0 +1,64 @@
+"""Adaptives Polling: aktive Räume oft, inaktive Räume mit exponentiellem Backoff."""
+from __future__ import annotations
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .model import RoomStatus
+
+
+class AdaptivePollScheduler:
+    """Entscheidet pro Raum, ob room_player_status in diesem Zyklus abgefragt wird.
+
+    Spielende oder kürzlich bediente Räume werden alle `active_interval` Sekunden gepollt.
+    Inaktive Räume starten bei `idle_interval` und verdoppeln bis `idle_max_interval`.
+    """
+
+    # Nach einem Befehl bleibt ein Raum so lange "aktiv"
+    RECENT_COMMAND_WINDOW = 30  # seconds
+
+    def __init__(self, active_interval: float, idle_interval: float, idle_max_interval: float) -> None:
+        self.active_interval = active_interval
+        self.idle_interval = idle_interval
+        self.idle_max_interval = idle_max_interval
+        self._next_due: Dict[str, float] = {}
+        self._idle_backoff: Dict[str, float] = {}
+        self._active_until: Dict[str, float] = {}
+
+    def configure(self, active_interval: float, idle_interval: float, idle_max_interval: float) -> None:
+        self.active_interval = active_interval
+        self.idle_interval = idle_interval
+        self.idle_max_interval = idle_max_interval
+        self._idle_backoff.clear()
+
+    def due_rooms(self, room_ids: Iterable[str], now: Optional[float] = None) -> List[str]:
+        now = time.monotonic() if now is None else now
+        return [rid for rid in room_ids if self._next_due.get(rid, 0.0) <= now]
+
+    def mark_active(self, room_id: str, now: Optional[float] = None) -> None:
+        """Raum wurde bedient: sofort fällig und für eine Weile schnell pollen."""
+        now = time.monotonic() if now is None else now
+        self._active_until[room_id] = now + self.RECENT_COMMAND_WINDOW
+        self._idle_backoff.pop(room_id, None)
+        self._next_due[room_id] = now
+
+    def record(self, room_id: str, status: Optional[RoomStatus], now: Optional[float] = None) -> float:
+        """Ergebnis einer Abfrage verbuchen (status=None bei Fehler); liefert das neue Intervall."""
+        now = time.monotonic() if now is None else now
+        if (status is not None and status.playing) or self._active_until.get(room_id, 0.0) > now:
+            self._idle_backoff.pop(room_id, None)
+            interval = self.active_interval
+        elif status is None:
+            interval = self.idle_interval
+        else:
+            prev = self._idle_backoff.get(room_id)
+            interval = self.idle_interval if prev is None else min(prev * 2, self.idle_max_interval)
+            self._idle_backoff[room_id] = interval
+        self._next_due[room_id] = now + interval
+        return interval
+
+    def forget(self, keep: Iterable[str]) -> None:
+        """Zeitpläne für nicht mehr vorhandene Räume verwerfen."""
+        keep = set(keep)
+        for d in (self._next_due, self._idle_backoff, self._active_until):
+            for rid in [r for r in d if r not in keep]:
+                d.pop(rid, None)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+from typing import Callable, Optional
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from .const import DOMAIN
+
+
+def _p95(data: dict) -> Optional[float]:
+    stats = data["client"].metrics.endpoints.get("room_player_status")
+    value = stats.percentiles((95,))["p95"] if stats else None
+    return round(value * 1000.0, 1) if value is not None else None
+
+
+def _errors(data: dict) -> int:
+    return sum(s.errors for s in data["client"].metrics.endpoints.values())
+
+
+def _cycle(data: dict) -> Optional[float]:
+    last = data["poll_metrics"].last_cycle
+    return round(last, 3) if last is not None else None
+
+
+def _staleness(data: dict) -> Optional[float]:
+    value = data["poll_metrics"].max_staleness()
+    return round(value, 1) if value is not None else None
+
+
+# key, Name, Einheit, Wertfunktion (liest aus hass.data[DOMAIN][entry_id])
+DIAGNOSTIC_SENSORS: tuple[tuple[str, str, Optional[str], Callable[[dict], object]], ...] = (
+    ("cycle_duration", "Poll cycle duration", UnitOfTime.SECONDS, _cycle),
+    ("status_latency_p95", "Status latency p95", UnitOfTime.MILLISECONDS, _p95),
+    ("request_errors", "Request errors", None, _errors),
+    ("max_room_staleness", "Max room staleness", UnitOfTime.SECONDS, _staleness),
+)
+
+
+async def async_setup_entry(hass, entry: ConfigEntry, async_add_entities):
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data["coordinator"]
+    async_add_entities(
+        VeoDiagnosticSensor(coordinator, entry, key, name, unit, fn)
+        for key, name, unit, fn in DIAGNOSTIC_SENSORS
+    )
+
+
+class VeoDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Diagnose-Sensor für Controller-Latenz und Polling (standardmäßig deaktiviert)."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, coordinator, entry: ConfigEntry, key: str, name: str, unit: Optional[str], fn) -> None:
+        super().__init__(coordinator)
+        self._entry = entry
+        self._fn = fn
+        self._attr_name = f"Veoovibes {name}"
+        self._attr_unique_id = f"{entry.entry_id}_{key}"
+        self._attr_native_unit_of_measurement = unit
+        if unit is None:
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name="Veoovibes Controller",
+            manufacturer="inveoo",
+            configuration_url=entry.data.get("base_url"),
+        )
+
+    @property
+    def available(self) -> bool:
+        # Metriken sind auch bei fehlgeschlagenem Refresh aussagekräftig
+        return True
+
+    @property
+    def native_value(self):
+        return self._fn(self.hass.data[DOMAIN][self._entry.entry_id])
@@ -0,0 +1,160 @@
+"""Services der Integration: Topologie neu laden, Sammelbefehle für mehrere Räume."""
+from __future__ import annotations
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.service import async_extract_entity_ids
+
+from .const import (
+    DOMAIN,
+    SERVICE_REFRESH_ROOMS,
+    SERVICE_BULK_COMMAND,
+    BULK_COMMANDS,
+    DEFAULT_BULK_CONCURRENCY,
+    MAX_IN_FLIGHT,
+)
+from .api import VeoovibesApiError
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_COMMAND = "command"
+ATTR_VOLUME_LEVEL = "volume_level"
+ATTR_SOURCE = "source"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+
+BULK_SCHEMA = vol.All(
+    cv.make_entity_service_schema(
+        {
+            vol.Required(ATTR_COMMAND): vol.In(BULK_COMMANDS),
+            vol.Optional(ATTR_VOLUME_LEVEL): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1.0)),
+            vol.Optional(ATTR_SOURCE): cv.string,
+            vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_BULK_CONCURRENCY): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=MAX_IN_FLIGHT)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key("entity_id", "area_id", "device_id"),
+)
+
+
+def _resolve_rooms(hass: HomeAssistant, entity_ids: set[str]) -> dict[str, tuple[str, str]]:
+    """entity_id -> (entry_id, room_id) für Raum-Entities dieser Integration."""
+    registry = er.async_get(hass)
+    out: dict[str, tuple[str, str]] = {}
+    for entity_id in sorted(entity_ids):
+        ent = registry.async_get(entity_id)
+        if ent is None or ent.platform != DOMAIN or "_room_" not in (ent.unique_id or ""):
+            continue
+        entry_id, room_id = ent.unique_id.split("_room_", 1)
+        if entry_id in hass.data.get(DOMAIN, {}):
+            out[entity_id] = (entry_id, room_id)
+    return out
+
+
+def _bulk_response(command: str, entity_ids: list[str], results: list) -> dict[str, dict]:
+    """Ergebnis je Entity; nur API-Fehler zählen als Fehlschlag, alles andere wird weitergeworfen."""
+    response: dict[str, dict] = {}
+    for entity_id, res in zip(entity_ids, results):
+        if isinstance(res, VeoovibesApiError):
+            _LOGGER.debug("bulk %s failed for %s: %s", command, entity_id, res)
+            response[entity_id] = {"success": False, "error": str(res)}
+        elif isinstance(res, BaseException):
+            raise res
+        else:
+            response[entity_id] = res
+    return response
+
+
+async def _async_bulk_command(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Einen Befehl parallel (begrenzt) an viele Räume senden, danach ein Refresh je Controller."""
+    command = call.data[ATTR_COMMAND]
+    if command == "volume" and ATTR_VOLUME_LEVEL not in call.data:
+        raise ServiceValidationError("volume_level is required for command 'volume'")
+    if command == "source" and not call.data.get(ATTR_SOURCE):
+        raise ServiceValidationError("source is required for command 'source'")
+    targets = _resolve_rooms(hass, await async_extract_entity_ids(hass, call))
+    if not targets:
+        raise ServiceValidationError("no Veoovibes room entities match the given target")
+
+    # Quelle einmal je Eintrag auflösen statt je Raum
+    source_keys: dict[str, tuple[int, int]] = {}
+    if command == "source":
+        source = call.data[ATTR_SOURCE]
+        for entry_id in {entry_id for entry_id, _ in targets.values()}:
+            match = hass.data[DOMAIN][entry_id]["source_index"].by_name.get(source)
+            if match is not None:
+                source_keys[entry_id] = match
+        if not source_keys:
+            raise ServiceValidationError(f"source '{source}' is not in the source map of any targeted entry")
+
+    sem = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENCY])
+
+    async def _one(entry_id: str, room_id: str) -> dict:
+        data = hass.data[DOMAIN][entry_id]
+        client = data["client"]
+        result = {"success": True}
+        async with sem:
+            if command == "play":
+                await client.play_room(room_id)
+            elif command == "stop":
+                await client.stop_room(room_id)
+            elif command == "volume":
+                sent = await client.set_room_volume(room_id, int(call.data[ATTR_VOLUME_LEVEL] * 100.0))
+                if not sent:
+                    # ein neuerer Lautstärke-Befehl für diesen Raum wurde stattdessen gesendet
+                    result = {"success": False, "superseded": True}
+            elif command == "source":
+                match = source_keys.get(entry_id)
+                if match is None:
+                    # Quelle fehlt nur in der Quellenliste dieses Controllers
+                    return {
+                        "success": False,
+                        "error": f"source '{call.data[ATTR_SOURCE]}' not in this entry's source map",
+                    }
+                await client.music_room(room_id, *match)
+        data["scheduler"].mark_active(room_id)
+        return result
+
+    results = await asyncio.gather(
+        *(_one(entry_id, room_id) for entry_id, room_id in targets.values()),
+        return_exceptions=True,
+    )
+    response = _bulk_response(command, list(targets), results)
+
+    # ein Refresh je betroffenem Controller; fällig sind nur die eben bedienten Räume
+    for entry_id in {entry_id for entry_id, _ in targets.values()}:
+        await hass.data[DOMAIN][entry_id]["coordinator"].async_refresh()
+    return {"results": response}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    if hass.services.has_service(DOMAIN, SERVICE_REFRESH_ROOMS):
+        return
+
+    async def _refresh_rooms(call: ServiceCall) -> None:
+        """Topologie-Cache aller Einträge verwerfen und neu laden."""
+        for entry_data in list(hass.data.get(DOMAIN, {}).values()):
+            entry_data["topology"].invalidate()
+            await entry_data["coordinator"].async_request_refresh()
+
+    async def _bulk_command(call: ServiceCall) -> ServiceResponse:
+        return await _async_bulk_command(hass, call)
+
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH_ROOMS, _refresh_rooms)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_COMMAND,
+        _bulk_command,
+        schema=BULK_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    for service in (SERVICE_REFRESH_ROOMS, SERVICE_BULK_COMMAND):
+        hass.services.async_remove(DOMAIN, service)
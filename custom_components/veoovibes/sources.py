@@ -0,0 +1,112 @@
+"""Index über die globale Quellenliste (einmal pro Änderung der source_map aufgebaut)."""
+from __future__ import annotations
+import json
+from types import MappingProxyType
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+
+import yaml
+
+from .model import RoomStatus
+
+
+def sources_from_data(data: Any) -> Tuple[Tuple[dict, ...], List[str]]:
+    """Geparste source_map prüfen -> (gültige Quellen, Problembeschreibungen).
+
+    Ungültige Einträge werden übersprungen, Duplikate bleiben (im Index gewinnt der erste);
+    beides wird gemeldet.
+    """
+    if data is None:
+        return (), []
+    if not isinstance(data, dict):
+        return (), ["top level must be a mapping with a 'sources' list"]
+    items = data.get("sources")
+    if items is None:
+        return (), ["missing 'sources' list"]
+    if not isinstance(items, list):
+        return (), ["'sources' must be a list"]
+    out: list[dict] = []
+    problems: list[str] = []
+    names: set[str] = set()
+    keys: set[Tuple[int, int]] = set()
+    for i, s in enumerate(items, start=1):
+        if not isinstance(s, dict):
+            problems.append(f"entry {i}: must be a mapping with name, group and prog")
+            continue
+        missing = [f for f in ("name", "group", "prog") if s.get(f) in (None, "")]
+        if missing:
+            problems.append(f"entry {i}: missing {', '.join(missing)}")
+            continue
+        try:
+            src = {"name": str(s["name"]), "group": int(s["group"]), "prog": int(s["prog"])}
+        except (TypeError, ValueError):
+            problems.append(f"entry {i} ({s['name']}): group and prog must be integers")
+            continue
+        key = (src["group"], src["prog"])
+        if src["name"] in names:
+            problems.append(f"entry {i}: duplicate name '{src['name']}'")
+        elif key in keys:
+            problems.append(f"entry {i} ({src['name']}): group {key[0]}/prog {key[1]} already used")
+        names.add(src["name"])
+        keys.add(key)
+        out.append(src)
+    return tuple(out), problems
+
+
+def parse_source_map(raw: str) -> Tuple[Tuple[dict, ...], List[str]]:
+    """source_map-Text (YAML, ersatzweise JSON) parsen und prüfen."""
+    if not raw or not str(raw).strip():
+        return (), []
+    try:
+        data = yaml.safe_load(raw)
+    except yaml.YAMLError as exc:
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            mark = getattr(exc, "problem_mark", None)
+            where = f" (line {mark.line + 1}, column {mark.column + 1})" if mark else ""
+            return (), [f"invalid YAML{where}: {getattr(exc, 'problem', None) or exc}"]
+    return sources_from_data(data)
+
+
+class SourceIndex:
+    """Unveränderlicher Index: name -> (group, prog), (group, prog) -> name, Namens-Tupel
+    und je Gruppe die (prog, name)-Einträge in Quellreihenfolge.
+    """
+
+    __slots__ = ("names", "by_name", "by_prog", "by_group")
+
+    def __init__(self, sources: Iterable[dict] = ()) -> None:
+        by_name: dict[str, Tuple[int, int]] = {}
+        by_prog: dict[Tuple[int, int], str] = {}
+        for s in sources:
+            key = (int(s["group"]), int(s["prog"]))
+            # erster Eintrag gewinnt (wie bisher bei next(...))
+            by_name.setdefault(s["name"], key)
+            by_prog.setdefault(key, s["name"])
+        self.names: Tuple[str, ...] = tuple(by_name)
+        self.by_name: Mapping[str, Tuple[int, int]] = MappingProxyType(by_name)
+        self.by_prog: Mapping[Tuple[int, int], str] = MappingProxyType(by_prog)
+        by_group: dict[int, list] = {}
+        for (group, prog), name in by_prog.items():
+            by_group.setdefault(group, []).append((prog, name))
+        self.by_group: Mapping[int, Tuple[Tuple[int, str], ...]] = MappingProxyType(
+            {group: tuple(items) for group, items in by_group.items()}
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def source_for_status(self, status: Optional[RoomStatus]) -> Optional[str]:
+        """Name der aktuell laufenden Quelle aus dem Raum-Status ableiten (falls bekannt)."""
+        if status is None:
+            return None
+        if status.source_key is not None:
+            name = self.by_prog.get(status.source_key)
+            if name is not None:
+                return name
+        if status.radio_name in self.by_name:
+            return status.radio_name
+        return None
+
+
+EMPTY_INDEX = SourceIndex()
@@ -0,0 +1,56 @@
+"""Cache für die Raum-Topologie (listrooms), unabhängig vom Status-Polling."""
+from __future__ import annotations
+import hashlib
+import json
+import time
+from typing import List, Optional
+
+from .api import VeoovibesClient
+
+
+def _fingerprint(rooms: List[dict]) -> str:
+    raw = json.dumps(rooms, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class RoomTopologyCache:
+    """Hält das letzte listrooms-Ergebnis und fragt es nur alle `interval` Sekunden neu ab.
+
+    Liefert eine neue Liste nur, wenn sich der Fingerprint geändert hat; sonst bleibt
+    das identische Listenobjekt erhalten (Konsumenten können per `is` vergleichen).
+    """
+
+    def __init__(self, client: VeoovibesClient, interval: float) -> None:
+        self._client = client
+        self.interval = interval
+        self._rooms: List[dict] = []
+        self._fingerprint: Optional[str] = None
+        self._fetched_at: Optional[float] = None
+
+    @property
+    def rooms(self) -> List[dict]:
+        return self._rooms
+
+    def seed(self, rooms: List[dict]) -> None:
+        """Mit gespeicherter Topologie vorbelegen; der nächste Abruf prüft trotzdem listrooms."""
+        self._rooms = rooms
+        self._fingerprint = _fingerprint(rooms)
+        self._fetched_at = None
+
+    def invalidate(self) -> None:
+        """Nächster Abruf lädt listrooms sicher neu."""
+        self._fetched_at = None
+
+    def _expired(self) -> bool:
+        return self._fetched_at is None or time.monotonic() - self._fetched_at >= self.interval
+
+    async def async_get_rooms(self) -> List[dict]:
+        if not self._expired():
+            return self._rooms
+        rooms = await self._client.list_rooms()
+        self._fetched_at = time.monotonic()
+        fp = _fingerprint(rooms)
+        if fp != self._fingerprint:
+            self._fingerprint = fp
+            self._rooms = rooms
+        return self._rooms
@@ -0,0 +1,9 @@
+"""Gemeinsame Test-Helfer: Repo-Root und benchmarks/ (Fake-Controller) importierbar machen."""
+from __future__ import annotations
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "benchmarks"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,157 @@
+"""VeoovibesClient gegen den Fake-Controller: Circuit Breaker, Timeouts, Projektion."""
+from __future__ import annotations
+import asyncio
+
+import aiohttp
+import pytest
+
+from fake_controller import FakeController
+from custom_components.veoovibes.api import (
+    VeoovibesApiError,
+    VeoovibesClient,
+    VeoovibesUnavailableError,
+)
+from custom_components.veoovibes.model import RoomStatus
+
+
+class FastClient(VeoovibesClient):
+    RETRY_BACKOFF = 0.001
+    PROBE_INTERVAL = 60  # Probe soll im Test nicht dazwischenfunken
+
+
+def _run(scenario, **controller):
+    async def main():
+        fc = FakeController(latency=0.0, seed=1, **controller)
+        url = await fc.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                client = FastClient(url, "key", False, session)
+                try:
+                    return await scenario(fc, client)
+                finally:
+                    client.close()
+        finally:
+            await fc.stop()
+
+    return asyncio.run(main())
+
+
+def test_room_5xx_does_not_open_breaker():
+    async def scenario(fc, client):
+        fc.failing_rooms.add(1)
+        for _ in range(5):
+            assert await client.get_room_statuses(["1"], 1, 5) == {}
+        assert client.available
+        assert fc.requests_by_cmd["room_player_status"] == 5 * (1 + client.read_retries)
+        await client.play_room(2)
+        assert fc.rooms[2].playing
+
+    _run(scenario, rooms=2)
+
+
+def test_breaker_counts_requests_not_attempts():
+    async def scenario(fc, client):
+        await fc.stop()  # Verbindung wird abgewiesen
+        for i in range(client.FAILURE_THRESHOLD):
+            assert client.available, f"breaker opened after {i} request(s)"
+            with pytest.raises(VeoovibesApiError):
+                await client.list_rooms()
+        assert not client.available
+        with pytest.raises(VeoovibesUnavailableError):
+            await client.play_room(1)
+
+    _run(scenario, rooms=1)
+
+
+def test_room_timeout_does_not_open_breaker():
+    async def scenario(fc, client):
+        fc.latency = 1.0  # Raum hängt länger als room_timeout
+        for _ in range(client.FAILURE_THRESHOLD + 2):
+            assert await client.get_room_statuses(["1"], 1, 0.05) == {}
+        assert client.available
+        assert client._failures == 0
+
+    _run(scenario, rooms=1)
+
+
+def test_api_failure_is_not_a_transport_error():
+    async def scenario(fc, client):
+        with pytest.raises(VeoovibesApiError):
+            await client.get_room_status(99)  # unbekannter Raum -> status "failed"
+        assert client.available
+        assert fc.requests_by_cmd["room_player_status"] == 1  # nicht wiederholt
+
+    _run(scenario, rooms=1)
+
+
+def test_projection_keeps_raw_keys_for_diagnostics():
+    async def scenario(fc, client):
+        rooms = await client.list_rooms()
+        assert rooms == [{"id_room": 1, "name": "Room 1", "key": "1"}]
+        status = await client.get_room_status(1)
+        assert "zone_volume" in status and "room" not in status
+        raw = client.raw_diagnostics()
+        assert "room" in raw["room_player_status"]["keys"]
+        assert raw["room_player_status"]["sample"]["room"] == "1"
+        assert raw["listrooms"]["keys"] == ["id_room", "name"]
+
+    _run(scenario, rooms=1)
+
+
+def test_volume_coalescing_sends_first_and_last_value():
+    async def scenario(fc, client):
+        results = await asyncio.gather(*(client.set_room_volume(1, v) for v in (10, 20, 30)))
+        # 10 sofort, 20 wird vom währenddessen eingetroffenen 30 überholt
+        assert results == [True, False, True]
+        assert fc.rooms[1].volume == 30
+        assert fc.requests_by_cmd["room_vol_set"] == 2
+        assert client.command_stats == {"volume_sent": 2, "volume_coalesced": 1}
+
+    _run(scenario, rooms=1)
+
+
+def test_single_volume_change_is_sent_immediately():
+    async def scenario(fc, client):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        assert await client.set_room_volume(1, 55) is True
+        assert loop.time() - start < 0.2
+        assert await client.set_room_volume(1, 60) is True
+        assert fc.requests_by_cmd["room_vol_set"] == 2
+
+    _run(scenario, rooms=1)
+
+
+def test_rate_limit_token_is_taken_before_queue_slot():
+    class _Limiter:
+        def __init__(self, client):
+            self.client = client
+            self.in_flight: list[int] = []
+
+        async def acquire(self):
+            self.in_flight.append(self.client.queue.as_dict()["in_flight"])
+            await asyncio.sleep(0.01)
+
+    async def scenario(fc, client):
+        client._rate_limiter = limiter = _Limiter(client)
+        await asyncio.gather(*(client.get_room_status(rid) for rid in (1, 2, 3)))
+        # beim Warten auf den Token ist noch kein Slot belegt
+        assert limiter.in_flight == [0, 0, 0]
+
+    _run(scenario, rooms=3)
+
+
+def test_playing_room_reports_progress():
+    async def scenario(fc, client):
+        await client.play_room(1)
+        fc.rooms[1]._elapsed = 42.0
+        st = RoomStatus.from_payload(await client.get_room_status(1))
+        assert st.playing and st.position == 42 and st.duration == fc.rooms[1].duration
+        await client.next_room(1)
+        st = RoomStatus.from_payload(await client.get_room_status(1))
+        assert st.position == 0 and st.title == "Track 2"
+        await client.stop_room(1)
+        st = RoomStatus.from_payload(await client.get_room_status(1))
+        assert st.position is None and st.duration is None
+
+    _run(scenario, rooms=1)
@@ -0,0 +1,84 @@
+"""ArtworkCache gegen einen kleinen aiohttp-Server: Deduplizierung, ETag-Revalidierung, Locks."""
+from __future__ import annotations
+import asyncio
+
+import aiohttp
+from aiohttp import web
+
+from custom_components.veoovibes.artwork import ArtworkCache
+
+IMAGE = b"\xff\xd8fake-jpeg"
+ETAG = '"v1"'
+
+
+def _run(scenario, tmp_path, delay=0.0):
+    async def main():
+        hits = {"full": 0, "not_modified": 0}
+
+        async def cover(request):
+            await asyncio.sleep(delay)
+            if request.headers.get("If-None-Match") == ETAG:
+                hits["not_modified"] += 1
+                return web.Response(status=304)
+            hits["full"] += 1
+            return web.Response(body=IMAGE, content_type="image/jpeg", headers={"ETag": ETAG})
+
+        app = web.Application()
+        app.router.add_get("/cover/{name}", cover)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            async with aiohttp.ClientSession() as session:
+                jobs: list = []
+
+                async def add_executor_job(func, *args):
+                    jobs.append(func.__name__)
+                    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+                cache = ArtworkCache(session, str(tmp_path), False, add_executor_job=add_executor_job)
+                return await scenario(cache, f"http://127.0.0.1:{port}/cover/", hits, jobs)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_fetch_once_and_release_lock(tmp_path):
+    async def scenario(cache, base, hits, jobs):
+        results = await asyncio.gather(*(cache.async_get(base + "a.jpg") for _ in range(5)))
+        assert results == [(IMAGE, "image/jpeg")] * 5
+        assert hits["full"] == 1
+        assert cache.stats["memory_hits"] == 4
+        # Plattenzugriffe laufen über den übergebenen Executor
+        assert "_disk_read" in jobs and "_disk_write" in jobs
+        assert cache._locks == {} and cache._lock_users == {}
+
+    _run(scenario, tmp_path, delay=0.05)
+
+
+def test_stale_entry_is_revalidated_with_etag(tmp_path):
+    async def scenario(cache, base, hits, jobs):
+        url = base + "b.jpg"
+        await cache.async_get(url)
+        cache.REVALIDATE_AFTER = 0
+        assert await cache.async_get(url) == (IMAGE, "image/jpeg")
+        assert hits == {"full": 1, "not_modified": 1}
+        assert cache.stats["not_modified"] == 1
+
+    _run(scenario, tmp_path)
+
+
+def test_disk_copy_survives_restart(tmp_path):
+    async def scenario(cache, base, hits, jobs):
+        url = base + "c.jpg"
+        await cache.async_get(url)
+        cache._memory.clear()
+        # Plattenkopie hat unbekanntes Alter: ausliefern nach 304, ohne erneuten Download
+        assert await cache.async_get(url) == (IMAGE, "image/jpeg")
+        assert cache.stats["disk_hits"] == 1
+        assert hits == {"full": 1, "not_modified": 1}
+
+    _run(scenario, tmp_path)
@@ -0,0 +1,75 @@
+"""Media-Browser: Gruppen, Seiten, TTL-Cache."""
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.components.media_player.errors import BrowseError
+
+from custom_components.veoovibes import browse_media
+from custom_components.veoovibes.browse_media import (
+    PAGE_SIZE,
+    ROOT_ID,
+    BrowseCache,
+    async_browse,
+    parse_source_id,
+)
+from custom_components.veoovibes.sources import SourceIndex
+
+
+def _index(group_sizes: dict[int, int]) -> SourceIndex:
+    return SourceIndex(
+        {"name": f"G{group} #{prog}", "group": group, "prog": prog}
+        for group, size in group_sizes.items()
+        for prog in range(1, size + 1)
+    )
+
+
+def test_single_group_is_shown_directly():
+    node = async_browse(_index({1: 3}), BrowseCache(), None)
+    assert node.media_content_id == ROOT_ID
+    assert [c.media_content_id for c in node.children] == ["source:1:1", "source:1:2", "source:1:3"]
+    assert parse_source_id(node.children[2].media_content_id) == (1, 3)
+
+
+def test_large_group_is_paginated():
+    index = _index({1: 2, 2: PAGE_SIZE * 2 + 5})
+    cache = BrowseCache()
+    root = async_browse(index, cache, None)
+    assert [c.media_content_id for c in root.children] == ["group:1", "group:2"]
+
+    group = async_browse(index, cache, "group:2")
+    assert [c.media_content_id for c in group.children] == [
+        "group:2:page:0", "group:2:page:1", "group:2:page:2",
+    ]
+    last = async_browse(index, cache, "group:2:page:2")
+    assert len(last.children) == 5
+    assert last.children[0].media_content_id == f"source:2:{PAGE_SIZE * 2 + 1}"
+    assert last.title == f"Group 2: {PAGE_SIZE * 2 + 1}–{PAGE_SIZE * 2 + 5}"
+
+    with pytest.raises(BrowseError):
+        async_browse(index, cache, "group:2:page:3")
+    with pytest.raises(BrowseError):
+        async_browse(index, cache, "group:x")
+
+
+def test_nodes_are_cached_per_index_until_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(browse_media.time, "monotonic", lambda: now[0])
+    index = _index({1: 3, 2: 3})
+    cache = BrowseCache()
+    first = async_browse(index, cache, "group:1")
+    assert async_browse(index, cache, "group:1") is first
+    # neuer Index (Quellen geändert): eigener Schlüssel, kein veralteter Knoten
+    assert async_browse(_index({1: 4, 2: 3}), cache, "group:1") is not first
+    now[0] += BrowseCache.TTL + 1
+    assert async_browse(index, cache, "group:1") is not first
+
+
+def test_cache_is_bounded():
+    index = _index({1: 3})
+    cache = BrowseCache()
+    cache.MAX_ITEMS = 2
+    for content_id in ("root", "group:1", "source-less"):
+        cache.put(index, content_id, object())
+    assert cache.get(index, "root") is None
+    assert cache.get(index, "source-less") is not None
@@ -0,0 +1,70 @@
+"""Hilfsfunktionen aus __init__.py (ohne laufendes Home Assistant)."""
+from __future__ import annotations
+from types import SimpleNamespace
+
+from custom_components.veoovibes import (
+    _room_timeout,
+    _snapshot_from_storage,
+    _snapshot_payload,
+    _snapshot_signature,
+)
+from custom_components.veoovibes.const import (
+    CONF_CONNECT_TIMEOUT,
+    CONF_READ_TIMEOUT,
+    CONF_ROOM_TIMEOUT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_ROOM_TIMEOUT,
+    KEY_ROOMS,
+    KEY_STATE,
+)
+from custom_components.veoovibes.model import RoomStatus
+
+
+def _entry(**options):
+    return SimpleNamespace(options=options)
+
+
+def test_room_timeout_covers_a_full_attempt():
+    assert DEFAULT_ROOM_TIMEOUT >= DEFAULT_CONNECT_TIMEOUT + DEFAULT_READ_TIMEOUT
+    assert _room_timeout(_entry()) == DEFAULT_ROOM_TIMEOUT
+    # ältere, zu kurze Optionen werden angehoben
+    assert _room_timeout(_entry(**{CONF_ROOM_TIMEOUT: 8})) == DEFAULT_CONNECT_TIMEOUT + DEFAULT_READ_TIMEOUT
+    assert _room_timeout(_entry(**{CONF_ROOM_TIMEOUT: 8, CONF_CONNECT_TIMEOUT: 2, CONF_READ_TIMEOUT: 30})) == 32
+    assert _room_timeout(_entry(**{CONF_ROOM_TIMEOUT: 60})) == 60
+
+
+def _data(**status):
+    payload = {"is_playing": 1, "zone_volume": 40, "title": "Song", "group": 1, "prog": 3}
+    payload.update(status)
+    return {
+        KEY_ROOMS: [{"id_room": 1, "name": "Bad", "key": "1"}],
+        KEY_STATE: {"1": RoomStatus.from_payload(payload)},
+    }
+
+
+def test_snapshot_leaves_out_position_and_duration():
+    payload = _snapshot_payload(_data(position=12, duration=200))
+    assert payload["state"]["1"] == {
+        "is_playing": 1, "zone_volume": 40, "title": "Song", "group": 1, "prog": 3,
+    }
+    assert payload["rooms"] == [{"id_room": 1, "name": "Bad", "key": "1"}]
+
+
+def test_snapshot_signature_ignores_playback_progress():
+    assert _snapshot_signature(_data(position=12)) == _snapshot_signature(_data(position=14))
+    assert _snapshot_signature(_data()) != _snapshot_signature(_data(zone_volume=41))
+    renamed = _data()
+    renamed[KEY_ROOMS] = [{"id_room": 1, "name": "Küche", "key": "1"}]
+    assert _snapshot_signature(_data()) != _snapshot_signature(renamed)
+
+
+def test_snapshot_restore_is_stale_and_matches_signature():
+    data = _data(position=12)
+    restored = _snapshot_from_storage(_snapshot_payload(data))
+    status = restored[KEY_STATE]["1"]
+    assert status.stale and status.playing and status.volume == 0.4
+    assert status.source_key == (1, 3) and status.position is None
+    assert _snapshot_signature(restored) == _snapshot_signature(data)
+    assert _snapshot_from_storage(None) is None
+    assert _snapshot_from_storage({"rooms": []}) is None
@@ -0,0 +1,161 @@
+"""VeoRoomEntity ohne laufendes Home Assistant: optimistische Befehle, State-Writes, Position."""
+from __future__ import annotations
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from homeassistant.components.media_player.const import MediaPlayerState
+
+from custom_components.veoovibes import media_player
+from custom_components.veoovibes.api import VeoovibesApiError
+from custom_components.veoovibes.const import DOMAIN, KEY_ROOMS, KEY_STATE
+from custom_components.veoovibes.media_player import VeoRoomEntity
+from custom_components.veoovibes.model import RoomStatus
+from custom_components.veoovibes.sources import SourceIndex
+
+
+class _Entity(VeoRoomEntity):
+    """Zählt State-Writes statt sie an Home Assistant zu geben."""
+
+    writes = 0
+
+    def async_write_ha_state(self) -> None:
+        self._last_signature = self._state_signature()
+        self.writes += 1
+
+
+class _Client:
+    available = True
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls: list[str] = []
+        self.status = {"is_playing": 0, "zone_volume": 20}
+
+    async def _cmd(self, name):
+        self.calls.append(name)
+        if self.fail:
+            raise VeoovibesApiError(f"{name} failed")
+
+    async def play_room(self, room_id):
+        await self._cmd("play")
+
+    async def next_room(self, room_id):
+        await self._cmd("next")
+
+    async def prev_room(self, room_id):
+        await self._cmd("prev")
+
+    async def music_room(self, room_id, group, prog):
+        await self._cmd(f"music {group}:{prog}")
+
+    async def get_room_status(self, room_id, priority=None):
+        return self.status
+
+
+def _entity(client=None, **status):
+    client = client or _Client()
+    active: list[str] = []
+    coordinator = SimpleNamespace(
+        data={KEY_ROOMS: [], KEY_STATE: {"1": RoomStatus.from_payload(status)}},
+        last_update_success=True,
+    )
+    entry = SimpleNamespace(entry_id="e1", options={}, data={"base_url": "http://veo"})
+    ent = _Entity(coordinator, client, entry, "1", "Küche")
+    ent.hass = SimpleNamespace(
+        data={
+            DOMAIN: {
+                "e1": {
+                    "scheduler": SimpleNamespace(mark_active=active.append, record=lambda *a: None),
+                    "poll_metrics": SimpleNamespace(room_updated=lambda *a: None),
+                    "source_index": SourceIndex([{"name": "Radio", "group": 3, "prog": 7}]),
+                }
+            }
+        }
+    )
+    return ent, client, active
+
+
+def test_optimistic_state_is_rolled_back_on_api_error():
+    ent, client, active = _entity(_Client(fail=True), is_playing=0)
+    assert ent.state == MediaPlayerState.OFF
+    with pytest.raises(VeoovibesApiError):
+        asyncio.run(ent._async_command(client.play_room("1"), state=MediaPlayerState.PLAYING))
+    assert ent.state == MediaPlayerState.OFF
+    # optimistisch gesetzt, dann zurückgerollt
+    assert ent.writes == 2
+    assert active == ["1"]
+
+
+def test_optimistic_state_shows_until_confirmed():
+    ent, client, _ = _entity(is_playing=0)
+    asyncio.run(ent._async_command(client.play_room("1"), state=MediaPlayerState.PLAYING))
+    assert ent.state == MediaPlayerState.PLAYING
+    # Controller bestätigt: optimistischer Wert wird verworfen
+    ent.coordinator.data[KEY_STATE]["1"] = RoomStatus.from_payload({"is_playing": 1})
+    ent._reconcile_optimistic()
+    assert ent._optimistic == {}
+
+
+@pytest.mark.parametrize(
+    ("method", "args", "expected"),
+    [
+        ("async_media_next_track", (), "next"),
+        ("async_media_previous_track", (), "prev"),
+        ("async_select_source", ("Radio",), "music 3:7"),
+    ],
+)
+def test_track_and_source_commands_mark_room_active(method, args, expected):
+    ent, client, active = _entity()
+    asyncio.run(getattr(ent, method)(*args))
+    assert client.calls == [expected]
+    assert active == ["1"]
+
+
+def _update(ent, **status):
+    ent.coordinator.data[KEY_STATE]["1"] = RoomStatus.from_payload(status)
+    ent._handle_coordinator_update()
+
+
+def test_unchanged_room_skips_state_write():
+    ent, _, _ = _entity(is_playing=1, zone_volume=20, title="A")
+    ent.async_write_ha_state()
+    writes = ent.writes
+    _update(ent, is_playing=1, zone_volume=20, title="A")
+    assert ent.writes == writes
+    _update(ent, is_playing=1, zone_volume=25, title="A")
+    assert ent.writes == writes + 1
+
+
+def test_position_is_anchored_until_track_change_or_drift(monkeypatch):
+    now = [datetime(2024, 1, 1, tzinfo=timezone.utc)]
+    monkeypatch.setattr(media_player.dt_util, "utcnow", lambda: now[0])
+    track = {"is_playing": 1, "title": "A", "duration": 200}
+    ent, _, _ = _entity(elapsed=10, **track)
+    ent._sync_position()
+    anchored_at = ent.media_position_updated_at
+    assert (ent.media_position, ent.media_duration) == (10, 200)
+
+    # Position läuft wie erwartet weiter: Anker bleibt, kein State-Write
+    ent.async_write_ha_state()
+    writes = ent.writes
+    now[0] += timedelta(seconds=5)
+    _update(ent, elapsed=15, **track)
+    assert ent.media_position == 10 and ent.media_position_updated_at == anchored_at
+    assert ent.writes == writes
+
+    # Sprung (Seek) über POSITION_DRIFT hinaus: neu verankern
+    now[0] += timedelta(seconds=5)
+    _update(ent, elapsed=60, **track)
+    assert ent.media_position == 60 and ent.media_position_updated_at == now[0]
+
+    # Titelwechsel: neu verankern, auch ohne Drift
+    now[0] += timedelta(seconds=1)
+    _update(ent, elapsed=61, **{**track, "title": "B"})
+    assert ent.media_position == 61 and ent.media_position_updated_at == now[0]
+
+    # Stopp ohne Positionsangabe: Anker verwerfen
+    _update(ent, is_playing=0)
+    assert ent.media_position is None and ent.media_position_updated_at is None
@@ -0,0 +1,44 @@
+"""RoomPoller gegen den Fake-Controller: fällige Räume, veraltete Räume bei Fehlern."""
+from __future__ import annotations
+import asyncio
+
+import aiohttp
+
+from fake_controller import FakeController
+from custom_components.veoovibes.api import VeoovibesClient
+from custom_components.veoovibes.const import KEY_STATE
+from custom_components.veoovibes.metrics import PollMetrics
+from custom_components.veoovibes.poller import RoomPoller
+from custom_components.veoovibes.scheduler import AdaptivePollScheduler
+from custom_components.veoovibes.topology import RoomTopologyCache
+
+
+def test_failed_room_is_marked_stale_and_breaker_stays_closed():
+    async def main():
+        fc = FakeController(rooms=2, latency=0.0)
+        url = await fc.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                client = VeoovibesClient(url, "key", False, session, read_retries=0)
+                scheduler = AdaptivePollScheduler(0, 0, 0)  # jeder Raum in jedem Zyklus fällig
+                poller = RoomPoller(
+                    client, RoomTopologyCache(client, 300), scheduler, PollMetrics(), 2, 1
+                )
+                data = await poller.async_poll(None)
+                assert not any(st.stale for st in data[KEY_STATE].values())
+
+                fc.failing_rooms.add(1)
+                for _ in range(client.FAILURE_THRESHOLD + 1):
+                    data = await poller.async_poll(data)
+                assert client.available
+                assert data[KEY_STATE]["1"].stale
+                assert not data[KEY_STATE]["2"].stale
+
+                fc.failing_rooms.clear()
+                data = await poller.async_poll(data)
+                assert not data[KEY_STATE]["1"].stale
+                client.close()
+        finally:
+            await fc.stop()
+
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+"""Dry-Run-Messung: Empfehlungen und Messung gegen den Fake-Controller."""
+from __future__ import annotations
+import asyncio
+
+import aiohttp
+
+from fake_controller import FakeController
+from custom_components.veoovibes.const import (
+    CONF_ACTIVE_INTERVAL,
+    CONF_IDLE_INTERVAL,
+    CONF_IDLE_MAX_INTERVAL,
+    CONF_MAX_CONCURRENCY,
+    CONF_ROOM_TIMEOUT,
+    DEFAULT_ACTIVE_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    DEFAULT_IDLE_MAX_INTERVAL,
+    DEFAULT_ROOM_TIMEOUT,
+    MAX_IN_FLIGHT,
+)
+from custom_components.veoovibes.probe import ProbeResult, async_probe_controller, probe_client
+
+
+def test_fast_controller_keeps_defaults():
+    rec = ProbeResult(rooms=10, listrooms=0.02, status=(0.02, 0.03)).recommend()
+    assert rec == {
+        CONF_ACTIVE_INTERVAL: DEFAULT_ACTIVE_INTERVAL,
+        CONF_IDLE_INTERVAL: DEFAULT_IDLE_INTERVAL,
+        CONF_IDLE_MAX_INTERVAL: DEFAULT_IDLE_MAX_INTERVAL,
+        CONF_MAX_CONCURRENCY: 1,
+        CONF_ROOM_TIMEOUT: DEFAULT_ROOM_TIMEOUT,
+    }
+
+
+def test_slow_controller_gets_more_concurrency_and_longer_intervals():
+    probe = ProbeResult(rooms=200, listrooms=0.5, status=(0.3, 0.4))
+    rec = probe.recommend()
+    assert rec[CONF_MAX_CONCURRENCY] == MAX_IN_FLIGHT
+    assert rec[CONF_IDLE_INTERVAL] >= probe.cycle_time(MAX_IN_FLIGHT)
+    assert rec[CONF_IDLE_MAX_INTERVAL] >= rec[CONF_IDLE_INTERVAL]
+
+
+def test_cycle_time_never_assumes_more_than_in_flight_limit():
+    probe = ProbeResult(rooms=64, listrooms=0.1, status=(0.1,))
+    assert probe.cycle_time(32) == probe.cycle_time(MAX_IN_FLIGHT)
+
+
+def test_without_status_samples_listrooms_latency_is_used():
+    probe = ProbeResult(rooms=4, listrooms=0.2, errors=3)
+    assert probe.status_max == probe.status_median == 0.2
+    assert probe.placeholders()["errors"] == "3"
+
+
+def test_probe_against_fake_controller():
+    async def main():
+        fc = FakeController(rooms=12, latency=0.01)
+        url = await fc.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                result = await async_probe_controller(probe_client(session, url, "key", False), 3)
+        finally:
+            await fc.stop()
+        assert result.rooms == 12
+        assert len(result.status) == 3 and result.errors == 0
+        assert fc.requests_by_cmd == {"listrooms": 1, "room_player_status": 3}
+        # Wartezeit im Limiter zählt nicht zur Latenz
+        assert result.status_max < 0.2
+
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""RequestScheduler: Befehle vor Polls, FIFO je Raum, In-Flight-Limit."""
+from __future__ import annotations
+import asyncio
+
+from custom_components.veoovibes.request_queue import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    RequestScheduler,
+)
+
+
+def test_in_flight_limit_and_command_priority():
+    async def main():
+        queue = RequestScheduler(2)
+        release = asyncio.Event()
+        order: list[str] = []
+        peak = 0
+        running = 0
+
+        async def job(name: str, priority: int) -> None:
+            nonlocal peak, running
+            async with queue.slot(priority):
+                running += 1
+                peak = max(peak, running)
+                order.append(name)
+                await release.wait()
+                running -= 1
+
+        blockers = [asyncio.create_task(job(f"b{i}", PRIORITY_POLL)) for i in range(2)]
+        await asyncio.sleep(0)
+        waiting = [asyncio.create_task(job("poll", PRIORITY_POLL))]
+        await asyncio.sleep(0)
+        waiting.append(asyncio.create_task(job("cmd", PRIORITY_COMMAND)))
+        await asyncio.sleep(0)
+        assert queue.depth() == 2
+        release.set()
+        await asyncio.gather(*blockers, *waiting)
+        assert peak == 2
+        assert order[2:] == ["cmd", "poll"]
+        assert queue.as_dict()["in_flight"] == 0
+
+    asyncio.run(main())
+
+
+def test_commands_for_one_room_run_in_order():
+    async def main():
+        queue = RequestScheduler(8)
+        order: list[int] = []
+
+        async def command(i: int) -> None:
+            async with queue.slot(PRIORITY_COMMAND, "1"):
+                await asyncio.sleep(0.01 if i == 0 else 0)
+                order.append(i)
+
+        await asyncio.gather(*(command(i) for i in range(5)))
+        assert order == [0, 1, 2, 3, 4]
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_releases_slot():
+    async def main():
+        queue = RequestScheduler(1)
+        release = asyncio.Event()
+
+        async def hold() -> None:
+            async with queue.slot(PRIORITY_POLL):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+        await holder
+        await asyncio.gather(waiter, return_exceptions=True)
+        async with queue.slot(PRIORITY_POLL):
+            pass
+        assert queue.as_dict()["in_flight"] == 0
+
+    asyncio.run(main())
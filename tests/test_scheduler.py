@@ -0,0 +1,107 @@
+"""AdaptivePollScheduler (pro Raum), SharedPollScheduler (gemeinsamer Takt) und HostRateLimiter."""
+from __future__ import annotations
+import asyncio
+
+from custom_components.veoovibes.client_manager import ClientManager, HostRateLimiter, SharedPollScheduler
+from custom_components.veoovibes.model import RoomStatus
+from custom_components.veoovibes.scheduler import AdaptivePollScheduler
+
+PLAYING = RoomStatus.from_payload({"is_playing": 1})
+IDLE = RoomStatus.from_payload({"is_playing": 0})
+
+
+def test_idle_rooms_back_off_and_playing_rooms_stay_fast():
+    sched = AdaptivePollScheduler(2, 10, 40)
+    assert sched.due_rooms(["a", "b"], now=0) == ["a", "b"]
+    assert [sched.record("a", IDLE, now=0) for _ in range(4)] == [10, 20, 40, 40]
+    assert sched.record("b", PLAYING, now=0) == 2
+    assert sched.due_rooms(["a", "b"], now=5) == ["b"]
+    assert sched.record("c", None, now=0) == 10  # Fehler: Leerlauf-Intervall, kein Backoff
+
+
+def test_command_makes_room_due_and_active():
+    sched = AdaptivePollScheduler(2, 10, 40)
+    sched.record("a", IDLE, now=0)
+    sched.mark_active("a", now=1)
+    assert sched.due_rooms(["a"], now=1) == ["a"]
+    assert sched.record("a", IDLE, now=1) == 2
+    assert sched.record("a", IDLE, now=1 + sched.RECENT_COMMAND_WINDOW) == 10
+
+
+def test_forget_drops_removed_rooms():
+    sched = AdaptivePollScheduler(2, 10, 40)
+    sched.record("a", IDLE, now=0)
+    sched.record("b", IDLE, now=0)
+    sched.forget(["b"])
+    assert sched.due_rooms(["a", "b"], now=1) == ["a"]
+
+
+def test_shared_clock_refreshes_and_stops_on_close():
+    async def main():
+        manager = ClientManager()
+        calls = 0
+
+        async def refresh() -> None:
+            nonlocal calls
+            calls += 1
+
+        manager.scheduler.register("entry", refresh, 0.01)
+        await asyncio.sleep(0.1)
+        assert calls >= 3
+        await manager.async_close()
+        stopped = calls
+        await asyncio.sleep(0.05)
+        assert calls == stopped
+
+    asyncio.run(main())
+
+
+def test_shared_clock_uses_task_factory():
+    async def main():
+        names: list[str] = []
+
+        def factory(coro, name):
+            names.append(name)
+            return asyncio.create_task(coro)
+
+        sched = SharedPollScheduler(factory)
+
+        async def refresh() -> None:
+            pass
+
+        sched.register("entry", refresh, 0.01)
+        await asyncio.sleep(0.05)
+        sched.shutdown()
+        assert "veoovibes poll clock" in names
+        assert "veoovibes refresh entry" in names
+
+    asyncio.run(main())
+
+
+def test_rate_limiter_spaces_requests_without_serialising_waiters():
+    async def main():
+        limiter = HostRateLimiter(rate=20, burst=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        done: list[float] = []
+
+        async def one():
+            await limiter.acquire()
+            done.append(loop.time() - start)
+
+        await asyncio.gather(*(one() for _ in range(3)))
+        # 1 sofort, dann je 1/20 s
+        assert done[0] < 0.03
+        assert 0.09 <= done[2] < 0.2
+
+        # abgebrochener Wartender gibt seine Reservierung zurück
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        await asyncio.sleep(0.06)
+        t = loop.time()
+        await limiter.acquire()
+        assert loop.time() - t < 0.03
+
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""Ergebnisbehandlung von veoovibes.bulk_command (ohne laufendes Home Assistant)."""
+from __future__ import annotations
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.veoovibes import services
+from custom_components.veoovibes.api import VeoovibesApiError
+from custom_components.veoovibes.const import DOMAIN
+
+
+class _Client:
+    def __init__(self, fail_rooms=(), superseded_rooms=()):
+        self.fail_rooms = set(fail_rooms)
+        self.superseded_rooms = set(superseded_rooms)
+        self.calls: list[tuple] = []
+
+    async def play_room(self, room_id):
+        self.calls.append(("play", room_id))
+        if room_id in self.fail_rooms:
+            raise VeoovibesApiError("room_play failed")
+
+    async def set_room_volume(self, room_id, vol):
+        self.calls.append(("volume", room_id, vol))
+        return room_id not in self.superseded_rooms
+
+    async def music_room(self, room_id, source, prog):
+        self.calls.append(("source", room_id, source, prog))
+
+
+class _Coordinator:
+    def __init__(self):
+        self.refreshes = 0
+
+    async def async_refresh(self):
+        self.refreshes += 1
+
+
+def _entry_data(client, sources=None):
+    return {
+        "client": client,
+        "coordinator": _Coordinator(),
+        "scheduler": SimpleNamespace(mark_active=lambda room_id: None),
+        "source_index": SimpleNamespace(by_name=sources or {}),
+    }
+
+
+def _call(monkeypatch, entries, targets, **data):
+    hass = SimpleNamespace(data={DOMAIN: entries})
+
+    async def _extract(hass, call):
+        return set(targets)
+
+    monkeypatch.setattr(services, "async_extract_entity_ids", _extract)
+    monkeypatch.setattr(services, "_resolve_rooms", lambda hass, ids: targets)
+    data.setdefault(services.ATTR_MAX_CONCURRENCY, 4)
+    return asyncio.run(services._async_bulk_command(hass, SimpleNamespace(data=data)))
+
+
+def test_api_error_is_reported_per_room(monkeypatch):
+    client = _Client(fail_rooms={"2"})
+    entries = {"e1": _entry_data(client)}
+    targets = {"media_player.a": ("e1", "1"), "media_player.b": ("e1", "2")}
+    res = _call(monkeypatch, entries, targets, command="play")["results"]
+    assert res["media_player.a"] == {"success": True}
+    assert res["media_player.b"]["success"] is False
+    assert "room_play failed" in res["media_player.b"]["error"]
+    # ein Refresh je Controller, nicht je Raum
+    assert entries["e1"]["coordinator"].refreshes == 1
+
+
+def test_superseded_volume_is_not_reported_as_success(monkeypatch):
+    client = _Client(superseded_rooms={"2"})
+    entries = {"e1": _entry_data(client)}
+    targets = {"media_player.a": ("e1", "1"), "media_player.b": ("e1", "2")}
+    res = _call(monkeypatch, entries, targets, command="volume", volume_level=0.4)["results"]
+    assert res["media_player.a"] == {"success": True}
+    assert res["media_player.b"] == {"success": False, "superseded": True}
+    assert ("volume", "1", 40) in client.calls
+
+
+def test_source_missing_on_one_entry(monkeypatch):
+    c1, c2 = _Client(), _Client()
+    entries = {"e1": _entry_data(c1, {"Radio": (3, 7)}), "e2": _entry_data(c2)}
+    targets = {"media_player.a": ("e1", "1"), "media_player.b": ("e2", "5")}
+    res = _call(monkeypatch, entries, targets, command="source", source="Radio")["results"]
+    assert res["media_player.a"] == {"success": True}
+    assert res["media_player.b"]["success"] is False
+    assert c1.calls == [("source", "1", 3, 7)]
+    assert c2.calls == []
+
+
+def test_programming_errors_are_not_swallowed():
+    with pytest.raises(ValueError):
+        services._bulk_response("play", ["media_player.a"], [ValueError("bug")])
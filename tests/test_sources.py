@@ -0,0 +1,86 @@
+"""source_map: Validierung, Index und Datei-Fallback mit mehreren Einträgen."""
+from __future__ import annotations
+import os
+
+from custom_components.veoovibes import _load_sources_from_file, _set_global_sources
+from custom_components.veoovibes.model import RoomStatus
+from custom_components.veoovibes.sources import SourceIndex, parse_source_map
+
+VALID = """
+sources:
+  - name: FM4
+    group: 1
+    prog: 3
+  - name: Lounge
+    group: 2
+    prog: 1
+"""
+
+
+def test_valid_map():
+    sources, problems = parse_source_map(VALID)
+    assert problems == []
+    assert sources == (
+        {"name": "FM4", "group": 1, "prog": 3},
+        {"name": "Lounge", "group": 2, "prog": 1},
+    )
+
+
+def test_empty_map_is_not_an_error():
+    assert parse_source_map("") == ((), [])
+    assert parse_source_map("   \n") == ((), [])
+
+
+def test_invalid_entries_are_reported():
+    raw = (
+        "sources:\n"
+        "  - name: A\n    group: 1\n    prog: x\n"
+        "  - name: B\n    group: 1\n"
+        "  - name: C\n    group: 1\n    prog: 2\n"
+        "  - name: C\n    group: 2\n    prog: 2\n"
+        "  - name: D\n    group: 1\n    prog: 2\n"
+        "  - just a string\n"
+    )
+    sources, problems = parse_source_map(raw)
+    assert [s["name"] for s in sources] == ["C", "C", "D"]
+    assert problems == [
+        "entry 1 (A): group and prog must be integers",
+        "entry 2: missing prog",
+        "entry 4: duplicate name 'C'",
+        "entry 5 (D): group 1/prog 2 already used",
+        "entry 6: must be a mapping with name, group and prog",
+    ]
+
+
+def test_yaml_syntax_error_has_position():
+    sources, problems = parse_source_map("sources: [a: 1")
+    assert sources == ()
+    assert len(problems) == 1 and problems[0].startswith("invalid YAML (line 1")
+
+
+def test_wrong_top_level():
+    assert parse_source_map("foo")[1] == ["top level must be a mapping with a 'sources' list"]
+    assert parse_source_map("sources: 3")[1] == ["'sources' must be a list"]
+
+
+def test_index_first_entry_wins():
+    sources, _ = parse_source_map(VALID + "  - name: FM4\n    group: 9\n    prog: 9\n")
+    index = SourceIndex(sources)
+    assert index.names == ("FM4", "Lounge")
+    assert index.by_name["FM4"] == (1, 3)
+    status = RoomStatus.from_payload({"group": 2, "prog": 1})
+    assert index.source_for_status(status) == "Lounge"
+
+
+def test_source_file_change_reaches_every_entry(tmp_path):
+    path = tmp_path / "veoovibes_sources.yaml"
+    path.write_text(VALID, encoding="utf-8")
+    entries = [{}, {}]
+    for data in entries:
+        _set_global_sources(data, _load_sources_from_file(str(path)))
+
+    path.write_text(VALID.replace("FM4", "Ö1"), encoding="utf-8")
+    os.utime(path, ns=(1, 1))  # mtime sicher ändern
+    changed = [_set_global_sources(data, _load_sources_from_file(str(path))) for data in entries]
+    assert changed == [True, True]
+    assert all("Ö1" in data["source_index"].by_name for data in entries)
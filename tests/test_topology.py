@@ -0,0 +1,46 @@
+"""RoomTopologyCache: listrooms nur im Intervall, identische Liste bei unveränderter Topologie."""
+from __future__ import annotations
+import asyncio
+
+from custom_components.veoovibes.topology import RoomTopologyCache
+
+
+class StubClient:
+    def __init__(self, rooms: list[dict]) -> None:
+        self.rooms = rooms
+        self.calls = 0
+
+    async def list_rooms(self) -> list[dict]:
+        self.calls += 1
+        return [dict(r) for r in self.rooms]
+
+
+def test_cached_within_interval_and_same_object_when_unchanged():
+    async def main():
+        client = StubClient([{"id_room": 1, "key": "1"}])
+        topo = RoomTopologyCache(client, 300)
+        first = await topo.async_get_rooms()
+        assert await topo.async_get_rooms() is first
+        assert client.calls == 1
+        topo.invalidate()
+        assert await topo.async_get_rooms() is first
+        assert client.calls == 2
+        client.rooms.append({"id_room": 2, "key": "2"})
+        topo.invalidate()
+        changed = await topo.async_get_rooms()
+        assert changed is not first and len(changed) == 2
+
+    asyncio.run(main())
+
+
+def test_seed_is_checked_on_next_fetch():
+    async def main():
+        client = StubClient([{"id_room": 1, "key": "1"}])
+        topo = RoomTopologyCache(client, 300)
+        seeded = [{"id_room": 1, "key": "1"}]
+        topo.seed(seeded)
+        assert topo.rooms is seeded
+        assert await topo.async_get_rooms() is seeded
+        assert client.calls == 1
+
+    asyncio.run(main())